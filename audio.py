@@ -0,0 +1,174 @@
+# audio.py
+# Sound effects with an on-disk PCM cache and a fixed pool of mixer channels per sound.
+import os, time, pygame
+
+class AudioManager:
+    """Owns every sound the game plays, plus music volume and mute.
+
+    Each sound gets its own reserved mixer channels (its voice limit). When all of them
+    are busy, the voice that started first is cut off and reused, so heavy fire never
+    uses up the mixer or delays other sounds. Decoded PCM is cached in cache_dir, keyed
+    by source file and mixer format, so later startups skip MP3 decoding.
+    """
+
+    def __init__(self, cache_dir=".audio_cache"):
+        self.cache_dir = cache_dir
+        self.enabled = pygame.mixer.get_init() is not None
+        self.sounds = {}       # name -> Sound
+        self.pools = {}        # name -> [Channel]
+        self.started = {}      # Channel -> ticks when its current voice started
+        self.volume = 1.0
+        self.muted = False
+        # metrics
+        self.plays = {}
+        self.steals = {}
+        self.peak_voices = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.load_ms = 0.0
+
+    # ---------- Loading ----------
+    def _cache_path(self, path):
+        st = os.stat(path)
+        freq, fmt, chans = pygame.mixer.get_init()
+        base = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(self.cache_dir, f"{base}-{st.st_size}-{int(st.st_mtime)}-{freq}-{fmt}-{chans}.pcm")
+
+    def _load(self, path):
+        try:
+            cached = self._cache_path(path)
+        except OSError:
+            return None
+        try:
+            with open(cached, "rb") as f:
+                snd = pygame.mixer.Sound(buffer=f.read())
+            self.cache_hits += 1
+            return snd
+        except Exception:
+            pass
+        try:
+            snd = pygame.mixer.Sound(path)
+        except Exception:
+            return None
+        self.cache_misses += 1
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = cached + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(snd.get_raw())
+            os.replace(tmp, cached)
+        except Exception:
+            pass
+        return snd
+
+    def load(self, sounds):
+        """Load {name: (path, voices)} and reserve `voices` mixer channels for each sound."""
+        if not self.enabled:
+            return
+        t0 = time.perf_counter()
+        for name, (path, _voices) in sounds.items():
+            snd = self._load(path)
+            if snd:
+                self.sounds[name] = snd
+        total = sum(v for name, (_p, v) in sounds.items() if name in self.sounds)
+        # Reserved channels are never picked by a bare Sound.play(), so each pool stays exclusive
+        pygame.mixer.set_num_channels(max(total, pygame.mixer.get_num_channels()))
+        pygame.mixer.set_reserved(total)
+        idx = 0
+        for name, (_path, voices) in sounds.items():
+            if name not in self.sounds:
+                continue
+            self.pools[name] = [pygame.mixer.Channel(idx + i) for i in range(voices)]
+            idx += voices
+            self.plays[name] = 0
+            self.steals[name] = 0
+        self.load_ms = (time.perf_counter() - t0) * 1000
+        self._apply_volume()
+
+    def start_music(self, path):
+        if not self.enabled:
+            return
+        try:
+            pygame.mixer.music.load(path)
+            pygame.mixer.music.play(-1)
+        except Exception:
+            pass
+
+    # ---------- Playback ----------
+    def play(self, name):
+        snd = self.sounds.get(name)
+        if snd is None or self.muted:
+            return
+        pool = self.pools[name]
+        ch = None
+        for c in pool:
+            if not c.get_busy():
+                ch = c
+                break
+        if ch is None:
+            ch = min(pool, key=lambda c: self.started.get(c, 0))
+            self.steals[name] += 1
+        try:
+            ch.play(snd)
+        except Exception:
+            return
+        self.started[ch] = pygame.time.get_ticks()
+        self.plays[name] += 1
+        busy = self.busy_voices()
+        if busy > self.peak_voices:
+            self.peak_voices = busy
+
+    # ---------- Volume / mute ----------
+    def _apply_volume(self):
+        vol = 0.0 if self.muted else self.volume
+        try:
+            pygame.mixer.music.set_volume(vol)
+        except Exception:
+            pass
+        for snd in self.sounds.values():
+            try:
+                snd.set_volume(vol)
+            except Exception:
+                pass
+
+    def set_volume(self, vol):
+        """Set volume for music and sfx (0.0 - 1.0)."""
+        self.volume = max(0.0, min(1.0, vol))
+        self._apply_volume()
+
+    def toggle_mute(self):
+        self.muted = not self.muted
+        if self.muted:
+            for pool in self.pools.values():
+                for c in pool:
+                    c.stop()
+        self._apply_volume()
+
+    def stop(self):
+        if not self.enabled:
+            return
+        try:
+            pygame.mixer.music.stop()
+        except Exception:
+            pass
+        for pool in self.pools.values():
+            for c in pool:
+                c.stop()
+
+    # ---------- Metrics ----------
+    def busy_voices(self):
+        return sum(1 for pool in self.pools.values() for c in pool if c.get_busy())
+
+    def stats(self):
+        channels = sum(len(p) for p in self.pools.values())
+        return {
+            "channels": channels,
+            "busy": self.busy_voices(),
+            "peak_busy": self.peak_voices,
+            "load": round(self.busy_voices() / channels, 2) if channels else 0.0,
+            "plays": dict(self.plays),
+            "steals": dict(self.steals),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "load_ms": round(self.load_ms, 1),
+        }
@@ -0,0 +1,274 @@
+# leaderboard.py
+# Chain-wide leaderboard client: durable local queue, batched uploads, cached global top-N.
+import http.client, json, os, random, socket, threading, uuid
+from datetime import datetime
+from urllib.parse import urlsplit
+from scores import TS_FORMAT
+
+# Statuses meaning the server read the batch and refused its contents; anything else
+# (auth, wrong path, captive portals, outages) is retried, never dropped.
+REJECTED_STATUSES = (400, 413, 422)
+
+class LeaderboardError(Exception):
+    pass
+
+class LeaderboardClient:
+    """Syncs score records with a leaderboard server from a background thread.
+
+    submit() only appends the record to a local queue file, so a game never waits on the
+    network, and records survive restarts and outages. The worker thread uploads the queue
+    in batches over one keep-alive HTTP connection (reopened after errors), backing off
+    exponentially with jitter while the server is unreachable. It then refreshes the
+    global top-N, which top() serves from memory (seeded from cache_file at startup).
+
+    Every record carries a unique id so the server can drop duplicates when a batch is
+    re-sent after a lost response.
+
+    Sent records are not cut out of the queue one batch at a time: the byte offset of the
+    first unsent line is kept in `<queue_file>.sent`, each batch reads only its own lines
+    from there, and the file is compacted once it is fully sent or the sent prefix passes
+    compact_bytes.
+    """
+
+    def __init__(self, url, cabinet=None, queue_file="leaderboard_queue.jsonl",
+                 cache_file="leaderboard_cache.json", batch_size=50, top_n=10,
+                 interval=30.0, timeout=5.0, max_backoff=300.0, compact_bytes=1 << 20):
+        parts = urlsplit(url)
+        self.scheme = parts.scheme or "http"
+        self.netloc = parts.netloc
+        self.base_path = parts.path.rstrip("/")
+        self.cabinet = cabinet or socket.gethostname()
+        self.queue_file = queue_file
+        self.cache_file = cache_file
+        self.batch_size = batch_size
+        self.top_n = top_n
+        self.interval = interval
+        self.timeout = timeout
+        self.max_backoff = max_backoff
+        self.compact_bytes = compact_bytes
+        self.offset_file = queue_file + ".sent"
+
+        self.lock = threading.Lock()      # guards the queue file
+        self.wake = threading.Event()
+        self.stopping = threading.Event()
+        self.conn = None
+        self.backoff = 0.0
+        self.cached_top = []
+        self.cached_at = None
+        # stats
+        self.uploaded = 0
+        self.dropped = 0
+        self.failures = 0
+        self.last_error = None
+        self._load_cache()
+        self.sent_offset = 0
+        self.queued = 0                   # unsent records, so pending() needs no file I/O
+        self._open_queue()
+
+        self.worker = threading.Thread(target=self._run, name="leaderboard-sync", daemon=True)
+        self.worker.start()
+
+    # ---------- Game side (never blocks on the network) ----------
+    def submit(self, name, score, level, played_seconds):
+        rec = {"id": uuid.uuid4().hex, "ts": datetime.now().strftime(TS_FORMAT), "name": name,
+               "score": score, "level": level, "played": played_seconds, "cabinet": self.cabinet}
+        line = (json.dumps(rec) + "\n").encode("utf-8")
+        with self.lock:
+            try:
+                with open(self.queue_file, "ab") as f:
+                    f.write(line)
+            except Exception:
+                return
+            self.queued += 1
+        self.wake.set()
+
+    def top(self, n=5):
+        """Cached global top scores as (name, score, ts, level, played) rows, like load_top_scores."""
+        return self.cached_top[:n]
+
+    def pending(self):
+        return self.queued
+
+    def stats(self):
+        return {"pending": self.pending(), "uploaded": self.uploaded, "dropped": self.dropped,
+                "failures": self.failures, "last_error": self.last_error, "cached_at": self.cached_at}
+
+    def close(self, flush_timeout=2.0):
+        """Stop the worker, giving it up to flush_timeout seconds to finish an upload in progress."""
+        self.stopping.set()
+        self.wake.set()
+        self.worker.join(flush_timeout)
+
+    # ---------- Queue / cache files ----------
+    def _open_queue(self):
+        """Restore the sent offset and count what is still unsent (once, at startup)."""
+        try:
+            with open(self.offset_file, "r") as f:
+                offset = int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            offset = 0
+        try:
+            with open(self.queue_file, "rb+") as f:
+                size = f.seek(0, os.SEEK_END)
+                if size and (f.seek(size - 1), f.read(1))[1] != b"\n":
+                    f.write(b"\n")      # end a line torn by a crash so the next record starts clean
+                    size += 1
+                # the offset must point at the start of a line, or it's stale (e.g. crash during compaction)
+                if not 0 < offset <= size or (f.seek(offset - 1), f.read(1))[1] != b"\n":
+                    offset = 0
+                f.seek(offset)
+                self.queued = sum(1 for ln in f if ln.strip())
+        except OSError:
+            offset = 0
+        self.sent_offset = offset
+
+    def _next_batch(self):
+        """Up to batch_size unsent lines and the offset just past them. Reads only those lines;
+        appends only ever go to the end, so this needs no lock."""
+        lines = []
+        end = self.sent_offset
+        try:
+            with open(self.queue_file, "rb") as f:
+                f.seek(end)
+                while len(lines) < self.batch_size:
+                    ln = f.readline()
+                    if not ln.endswith(b"\n"):
+                        break            # EOF, or a line still being appended
+                    end += len(ln)
+                    if ln.strip():
+                        lines.append(ln)
+        except OSError:
+            pass
+        return lines, end
+
+    def _write_offset(self, offset):
+        tmp = self.offset_file + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(str(offset))
+        os.replace(tmp, self.offset_file)
+
+    def _mark_sent(self, end, count):
+        self._write_offset(end)
+        self.sent_offset = end
+        with self.lock:
+            self.queued = max(0, self.queued - count)
+            size = os.path.getsize(self.queue_file)
+            if end < size and end < self.compact_bytes:
+                return
+            # compact: keep only the unsent tail. Reset the offset first, so a crash in
+            # between re-sends some records (deduplicated by id) instead of skipping any.
+            with open(self.queue_file, "rb") as f:
+                f.seek(end)
+                rest = f.read()
+            self._write_offset(0)
+            self.sent_offset = 0
+            tmp = self.queue_file + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(rest)
+            os.replace(tmp, self.queue_file)
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.cached_top = [tuple(r) for r in data.get("top", [])]
+            self.cached_at = data.get("cached_at")
+        except Exception:
+            pass
+
+    def _save_cache(self):
+        try:
+            tmp = self.cache_file + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"cached_at": self.cached_at, "top": self.cached_top}, f)
+            os.replace(tmp, self.cache_file)
+        except Exception:
+            pass
+
+    # ---------- HTTP ----------
+    def _request(self, method, path, payload=None):
+        if self.conn is None:
+            cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            self.conn = cls(self.netloc, timeout=self.timeout)
+        body = json.dumps(payload).encode() if payload is not None else None
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        try:
+            self.conn.request(method, self.base_path + path, body=body, headers=headers)
+            resp = self.conn.getresponse()
+            data = resp.read()
+        except (OSError, http.client.HTTPException) as e:
+            self.conn.close()
+            self.conn = None
+            raise LeaderboardError(f"{method} {path}: {e}")
+        if resp.will_close:
+            self.conn.close()
+            self.conn = None
+        if resp.status >= 400:
+            raise LeaderboardError(f"{method} {path}: HTTP {resp.status}", resp.status)
+        try:
+            return json.loads(data or b"{}")
+        except ValueError:
+            raise LeaderboardError(f"{method} {path}: bad JSON response")
+
+    def _upload(self):
+        """Upload queued records in batches. Returns when the queue is empty."""
+        while not self.stopping.is_set():
+            batch, end = self._next_batch()
+            if not batch:
+                return
+            records = []
+            for ln in batch:
+                try:
+                    records.append(json.loads(ln))
+                except ValueError:
+                    pass                   # a torn line (e.g. power loss mid-write); skip it
+            torn = len(batch) - len(records)
+            try:
+                if records:
+                    self._request("POST", "/scores", {"records": records})
+            except LeaderboardError as e:
+                status = e.args[1] if len(e.args) > 1 else None
+                if status not in REJECTED_STATUSES:
+                    raise
+                # the payload itself was rejected and won't succeed on retry: drop it so it can't block the queue
+                self.dropped += len(batch)
+                self._mark_sent(end, len(batch))
+            else:
+                self._mark_sent(end, len(batch))
+                self.dropped += torn
+                self.uploaded += len(records)   # only once it's off the queue, so re-sends aren't counted
+                self.backoff = 0.0              # the server is answering: retry the next failure quickly
+
+    def _refresh_top(self):
+        data = self._request("GET", f"/top?n={self.top_n}")
+        try:
+            self.cached_top = [(r["name"], r["score"], r["ts"], str(r["level"]), r["played"]) for r in data["top"]]
+        except (KeyError, TypeError):
+            raise LeaderboardError("GET /top: unexpected response")
+        self.cached_at = datetime.now().strftime(TS_FORMAT)
+        self._save_cache()
+
+    def _run(self):
+        while not self.stopping.is_set():
+            failed = False
+            # the top-N refresh doesn't wait for the queue to drain, so a backlog can't starve it
+            for task in (self._upload, self._refresh_top):
+                try:
+                    task()
+                except (LeaderboardError, OSError, ValueError) as e:
+                    # local file errors (full disk, bad permissions) back off too instead of killing the worker
+                    failed = True
+                    self.failures += 1
+                    self.last_error = str(e.args[0]) if isinstance(e, LeaderboardError) else f"{type(e).__name__}: {e}"
+            if failed:
+                self.backoff = min(self.max_backoff, self.backoff * 2 if self.backoff else 1.0)
+                wait = self.backoff * random.uniform(0.5, 1.0)
+            else:
+                self.backoff = 0.0
+                self.last_error = None
+                wait = self.interval
+            # while backing off, new submissions must not trigger an early retry
+            (self.stopping if self.backoff else self.wake).wait(wait)
+            self.wake.clear()
+        if self.conn:
+            self.conn.close()
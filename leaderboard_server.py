@@ -0,0 +1,144 @@
+# leaderboard_server.py
+# Local stand-in for the chain-wide leaderboard, for testing LeaderboardClient.
+#   python leaderboard_server.py --port 8088 --data global_scores.txt
+#   python leaderboard_server.py --fail-rate 0.3 --delay 0.5      simulate a flaky network
+#
+#   POST /scores   {"records": [{"id", "ts", "name", "score", "level", "played", "cabinet"}, ...]}
+#   GET  /top?n=10 {"top": [...]}  sorted like load_top_scores
+import argparse, json, random, threading, time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+from scores import TS_FORMAT
+
+class Board:
+    """In-memory score store, optionally mirrored to an id|ts|name|score|level|played file."""
+
+    def __init__(self, data_file=None):
+        self.lock = threading.Lock()
+        self.records = {}         # id -> record
+        self.data_file = data_file
+        if data_file:
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.data_file, "r", encoding="utf-8") as f:
+                for ln in f:
+                    parts = ln.strip().split("|")
+                    if len(parts) != 6:
+                        continue
+                    rid, ts, name, score, level, played = parts
+                    try:
+                        self.records[rid] = {"id": rid, "ts": ts, "name": name, "score": int(score),
+                                             "level": level, "played": int(played)}
+                    except ValueError:
+                        continue
+        except OSError:
+            pass
+
+    def add(self, records):
+        """Store new records, ignoring ids already seen (re-sent batches). Returns how many were new."""
+        fresh = []
+        with self.lock:
+            for r in records:
+                rid = str(r["id"])
+                if rid in self.records:
+                    continue
+                rec = {"id": rid, "ts": str(r["ts"]), "name": str(r["name"])[:12], "score": int(r["score"]),
+                       "level": str(r["level"]), "played": int(r["played"])}
+                self.records[rid] = rec
+                fresh.append(rec)
+            if fresh and self.data_file:
+                with open(self.data_file, "a", encoding="utf-8") as f:
+                    for r in fresh:
+                        f.write(f"{r['id']}|{r['ts']}|{r['name']}|{r['score']}|{r['level']}|{r['played']}\n")
+        return len(fresh)
+
+    def top(self, n):
+        def key(r):
+            try:
+                when = -datetime.strptime(r["ts"], TS_FORMAT).timestamp()
+            except ValueError:
+                when = 0
+            return (-r["score"], r["played"], when)
+        with self.lock:
+            rows = sorted(self.records.values(), key=key)[:n]
+        return [{k: r[k] for k in ("name", "score", "ts", "level", "played")} for r in rows]
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"     # keep-alive, so clients can reuse their connection
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _flaky(self):
+        cfg = self.server.cfg
+        if cfg.delay:
+            time.sleep(random.uniform(0, cfg.delay))
+        if cfg.fail_rate and random.random() < cfg.fail_rate:
+            self._reply(503, {"error": "simulated outage"})
+            return True
+        return False
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length)
+        if self._flaky():
+            return
+        if urlsplit(self.path).path != "/scores":
+            self._reply(404, {"error": "not found"})
+            return
+        try:
+            records = json.loads(raw)["records"]
+            accepted = self.server.board.add(records)
+        except (ValueError, KeyError, TypeError):
+            self._reply(400, {"error": "bad records"})
+            return
+        self._reply(200, {"accepted": accepted, "received": len(records)})
+
+    def do_GET(self):
+        if self._flaky():
+            return
+        url = urlsplit(self.path)
+        if url.path != "/top":
+            self._reply(404, {"error": "not found"})
+            return
+        try:
+            n = max(1, min(100, int(parse_qs(url.query).get("n", ["10"])[0])))
+        except ValueError:
+            n = 10
+        self._reply(200, {"top": self.server.board.top(n)})
+
+    def log_message(self, fmt, *args):
+        if self.server.cfg.verbose:
+            super().log_message(fmt, *args)
+
+def main():
+    ap = argparse.ArgumentParser(description="Stand-in leaderboard server for testing")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8088)
+    ap.add_argument("--data", help="persist records to this file")
+    ap.add_argument("--fail-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    ap.add_argument("--delay", type=float, default=0.0, help="random extra latency up to this many seconds")
+    ap.add_argument("--verbose", action="store_true", help="log every request")
+    args = ap.parse_args()
+
+    httpd = ThreadingHTTPServer((args.host, args.port), Handler)
+    httpd.board = Board(args.data)
+    httpd.cfg = args
+    print(f"[leaderboard] serving on http://{args.host}:{args.port} ({len(httpd.board.records)} records)")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+
+if __name__ == "__main__":
+    main()
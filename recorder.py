@@ -0,0 +1,131 @@
+# recorder.py
+# Keeps the last few seconds of gameplay in memory and writes clips with cv2.VideoWriter on a worker thread.
+import os, queue, threading, time
+import numpy as np, cv2, pygame
+
+class ClipRecorder:
+    """Ring buffer of the last `seconds` of frames, saved to video on demand.
+
+    capture() is called once per game frame with the final screen surface. It reads the
+    surface's pixel buffer in place and writes a `scale`d 3-channel BGR frame straight into
+    a preallocated ring slot, so no per-frame arrays are created and the worker thread can
+    encode slots as they are. Memory is slots * width * height * 3 * scale**2 bytes
+    (about 12 MB per second of clip for a 900x600 window at the defaults).
+    """
+
+    def __init__(self, surface, seconds=5, fps=30, source_fps=60, fourcc="mp4v", scale=0.5):
+        self.src_width, self.src_height = surface.get_size()
+        # even sizes keep the common codecs happy
+        self.width = max(2, int(self.src_width * scale) & ~1)
+        self.height = max(2, int(self.src_height * scale) & ~1)
+        self.fps = fps
+        self.every = max(1, round(source_fps / fps))
+        self.slots = max(1, int(seconds * fps))
+        self.fourcc = fourcc
+        self.ring = None
+        self.to_bgr = None        # cv2 conversion from the surface's raw 4-byte pixels, if known
+        self.small = None         # resize target for 32-bit surfaces
+        self._allocate(surface)
+        self.head = 0             # next slot to write
+        self.count = 0            # valid frames in the ring
+        self.frame_no = 0
+        self.busy = threading.Event()   # set while the ring is being encoded
+        self.jobs = queue.Queue()
+        self.worker = threading.Thread(target=self._run, name="clip-recorder", daemon=True)
+        self.worker.start()
+        # stats
+        self.captured = 0
+        self.dropped = 0
+        self.capture_time = 0.0
+        self.saved = []
+        self.failed = []          # (path, error)
+
+    # ---------- Main thread ----------
+    def _allocate(self, surface):
+        if surface.get_bytesize() == 4:
+            shifts = surface.get_shifts()
+            # byte order of the pixel in memory (little endian): shift 0 is the first byte
+            order = tuple(s // 8 for s in shifts[:3])
+            self.to_bgr = {(2, 1, 0): cv2.COLOR_BGRA2BGR, (0, 1, 2): cv2.COLOR_RGBA2BGR}.get(order)
+            self.small = np.empty((self.height, self.width, 4), np.uint8)
+        self.ring = np.empty((self.slots, self.height, self.width, 3), np.uint8)
+        # Touch every page now so the first lap through the ring doesn't page-fault inside the game loop
+        self.ring.fill(0)
+
+    def capture(self, surface):
+        self.frame_no += 1
+        if self.frame_no % self.every:
+            return
+        if self.busy.is_set():
+            self.dropped += 1
+            return
+        t0 = time.perf_counter()
+        slot = self.ring[self.head]
+        if self.to_bgr is not None:
+            buf = surface.get_buffer()
+            raw = None        # bound before the try so the finally can't mask a reshape error
+            try:
+                raw = np.frombuffer(buf, np.uint8).reshape(self.src_height, surface.get_pitch() // 4, 4)
+                cv2.resize(raw[:, :self.src_width], (self.width, self.height), dst=self.small,
+                           interpolation=cv2.INTER_AREA)
+                cv2.cvtColor(self.small, self.to_bgr, dst=slot)
+            finally:
+                del buf, raw
+        else:
+            # uncommon pixel formats: go through the RGB surfarray view
+            view = pygame.surfarray.pixels3d(surface)
+            try:
+                rgb = cv2.resize(np.ascontiguousarray(view.transpose(1, 0, 2)), (self.width, self.height),
+                                 interpolation=cv2.INTER_AREA)
+                cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR, dst=slot)
+            finally:
+                del view
+        self.head = (self.head + 1) % self.slots
+        self.count = min(self.count + 1, self.slots)
+        self.captured += 1
+        self.capture_time += time.perf_counter() - t0
+
+    def save(self, path):
+        """Queue the buffered frames for encoding. Returns False if a save is already running."""
+        if self.count == 0 or self.busy.is_set():
+            return False
+        self.busy.set()
+        self.jobs.put(path)
+        return True
+
+    def stats(self):
+        avg = (self.capture_time / self.captured * 1000) if self.captured else 0.0
+        return {"captured": self.captured, "dropped": self.dropped, "capture_ms": round(avg, 3),
+                "buffer_mb": round(self.ring.nbytes / 1e6, 1),
+                "saved": list(self.saved), "failed": list(self.failed)}
+
+    def close(self):
+        self.jobs.put(None)
+        self.worker.join()
+
+    # ---------- Worker thread ----------
+    def _run(self):
+        while True:
+            path = self.jobs.get()
+            if path is None:
+                return
+            try:
+                self._encode(path)
+                self.saved.append(path)
+            except Exception as e:
+                self.failed.append((path, str(e)))
+                print(f"[recorder] could not save {path}: {e}")
+            finally:
+                self.busy.clear()
+
+    def _encode(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*self.fourcc), self.fps, (self.width, self.height))
+        if not writer.isOpened():
+            raise IOError(f"no video writer for codec {self.fourcc!r}")
+        try:
+            start = (self.head - self.count) % self.slots
+            for i in range(self.count):
+                writer.write(self.ring[(start + i) % self.slots])
+        finally:
+            writer.release()
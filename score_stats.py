@@ -0,0 +1,166 @@
+# score_stats.py
+# Streaming analytics over high_score.txt logs (one or many cabinets).
+#   python score_stats.py logs/*.txt --jobs 8
+#   python score_stats.py logs/ --json > report.json
+import argparse, json, os, sys
+from collections import Counter
+from multiprocessing import Pool
+from scores import HIGH_SCORE_FILE, parse_score_line
+
+# ---------- Pipeline ----------
+def iter_lines(path, chunk_size=1 << 20):
+    """Yield decoded lines from a log file, reading it in fixed-size chunks."""
+    with open(path, "rb", buffering=chunk_size) as f:
+        for raw in f:
+            yield raw.decode("utf-8", errors="replace")
+
+def iter_records(lines):
+    """Yield parsed records, counting the lines load_top_scores would skip."""
+    for ln in lines:
+        rec = parse_score_line(ln)
+        if rec is None:
+            if ln.strip():
+                yield None
+            continue
+        yield rec
+
+class ScoreStats:
+    """Mergeable aggregate of score records.
+
+    Memory grows with the number of distinct players, score values, levels and days,
+    never with the number of lines, so multi-gigabyte logs stream in constant space.
+    """
+
+    def __init__(self):
+        self.games = 0
+        self.malformed = 0
+        self.bests = {}              # name -> (score, ts)
+        self.score_hist = Counter()  # score -> games
+        self.level_played = {}       # level -> [played seconds total, games]
+        self.daily = Counter()       # YYYY-MM-DD -> games
+
+    def add(self, rec):
+        if rec is None:
+            self.malformed += 1
+            return
+        ts, name, score, level_s, played = rec
+        self.games += 1
+        best = self.bests.get(name)
+        if best is None or score > best[0]:
+            self.bests[name] = (score, ts)
+        self.score_hist[score] += 1
+        if played is not None:
+            acc = self.level_played.setdefault(level_s, [0, 0])
+            acc[0] += played
+            acc[1] += 1
+        self.daily[ts[:10] if len(ts) >= 10 else "unknown"] += 1
+
+    def merge(self, other):
+        self.games += other.games
+        self.malformed += other.malformed
+        for name, (score, ts) in other.bests.items():
+            best = self.bests.get(name)
+            if best is None or score > best[0]:
+                self.bests[name] = (score, ts)
+        self.score_hist.update(other.score_hist)
+        for level, (total, n) in other.level_played.items():
+            acc = self.level_played.setdefault(level, [0, 0])
+            acc[0] += total
+            acc[1] += n
+        self.daily.update(other.daily)
+        return self
+
+    def percentiles(self, ps=(50, 75, 90, 95, 99)):
+        """Exact percentiles (nearest rank) from the score histogram."""
+        out = {}
+        if not self.games:
+            return out
+        targets = sorted((max(1, -(-p * self.games // 100)), p) for p in ps)
+        seen = 0
+        i = 0
+        for score in sorted(self.score_hist):
+            seen += self.score_hist[score]
+            while i < len(targets) and seen >= targets[i][0]:
+                out[targets[i][1]] = score
+                i += 1
+        return out
+
+    def report(self, top=10):
+        def level_key(lv):
+            return (0, int(lv)) if lv.isdigit() else (1, lv)
+        return {
+            "games": self.games,
+            "malformed_lines": self.malformed,
+            "players": len(self.bests),
+            "player_bests": [{"name": n, "score": s, "ts": ts} for n, (s, ts) in
+                             sorted(self.bests.items(), key=lambda kv: -kv[1][0])[:top]],
+            "score_percentiles": self.percentiles(),
+            "avg_played_seconds_by_level": {lv: round(t / n, 1) for lv, (t, n) in
+                                            sorted(self.level_played.items(), key=lambda kv: level_key(kv[0]))},
+            "daily_games": dict(sorted(self.daily.items())),
+        }
+
+def summarize_file(path):
+    stats = ScoreStats()
+    try:
+        for rec in iter_records(iter_lines(path)):
+            stats.add(rec)
+    except OSError as e:
+        print(f"[score_stats] skipping {path}: {e}", file=sys.stderr)
+    return stats
+
+def expand_paths(paths):
+    for p in paths:
+        if os.path.isdir(p):
+            for root, _dirs, files in os.walk(p):
+                for fn in sorted(files):
+                    yield os.path.join(root, fn)
+        else:
+            yield p
+
+def summarize(paths, jobs=1):
+    """Aggregate many log files, one worker process per file when jobs > 1."""
+    total = ScoreStats()
+    if jobs <= 1:
+        for p in paths:
+            total.merge(summarize_file(p))
+        return total
+    with Pool(jobs) as pool:
+        for part in pool.imap_unordered(summarize_file, paths):
+            total.merge(part)
+    return total
+
+# ---------- CLI ----------
+def print_report(rep):
+    print(f"Games: {rep['games']}   Players: {rep['players']}   Malformed lines: {rep['malformed_lines']}")
+    print("\nPlayer bests:")
+    for i, b in enumerate(rep["player_bests"], start=1):
+        print(f"  {i:>3}. {b['name'][:12]:<12} {b['score']:>8}   {b['ts']}")
+    print("\nScore percentiles:")
+    for p, v in sorted(rep["score_percentiles"].items()):
+        print(f"  p{p:<3} {v}")
+    print("\nAverage played seconds by level:")
+    for lv, avg in rep["avg_played_seconds_by_level"].items():
+        print(f"  level {lv:<6} {avg}")
+    print("\nGames per day:")
+    for day, n in rep["daily_games"].items():
+        print(f"  {day}  {n}")
+
+def main():
+    ap = argparse.ArgumentParser(description="Score history analytics for high_score.txt logs")
+    ap.add_argument("paths", nargs="*", default=[HIGH_SCORE_FILE], help="log files or directories of logs")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="parallel worker processes")
+    ap.add_argument("--top", type=int, default=10, help="players to list")
+    ap.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = ap.parse_args()
+
+    paths = list(expand_paths(args.paths))
+    stats = summarize(paths, jobs=min(args.jobs, len(paths)))
+    rep = stats.report(top=args.top)
+    if args.json:
+        print(json.dumps(rep, indent=2))
+    else:
+        print_report(rep)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# scores.py
+# high_score.txt format: one "ts|name|score|level|played_seconds" record per line.
+from datetime import datetime
+
+HIGH_SCORE_FILE = "high_score.txt"
+TS_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+def save_score_record(name, score, level, played_seconds):
+    ts = datetime.now().strftime(TS_FORMAT)
+    line = f"{ts}|{name}|{score}|{level}|{played_seconds}\n"
+    try:
+        with open(HIGH_SCORE_FILE, "a", encoding="utf-8") as f:
+            f.write(line)
+    except Exception:
+        pass
+
+def parse_score_line(ln):
+    """Parse one record into (ts, name, score, level, played).
+
+    Returns None for blank lines or lines without exactly 5 fields. A bad score reads as 0
+    and a bad played time as None, so callers can pick their own fallback.
+    """
+    ln = ln.strip()
+    if not ln:
+        return None
+    parts = ln.split("|")
+    if len(parts) != 5:
+        return None
+    ts, name, score_s, level_s, played_s = parts
+    try:
+        score = int(score_s)
+    except:
+        score = 0
+    try:
+        played = int(played_s)
+    except:
+        played = None
+    return ts, name, score, level_s, played
+
+def load_top_scores(n=5):
+    entries = []
+    try:
+        with open(HIGH_SCORE_FILE, "r", encoding="utf-8") as f:
+            for ln in f:
+                rec = parse_score_line(ln)
+                if rec is None:
+                    continue
+                ts, name, score, level_s, played = rec
+                entries.append((name, score, ts, level_s, 9999 if played is None else played))
+    except Exception:
+        pass
+
+    # Sort by score DESC, time ASC (shorter is better), date DESC (recent first)
+    entries.sort(key=lambda e: (-e[1], e[4], -int(datetime.strptime(e[2], TS_FORMAT).timestamp()) if e[2] else 0))
+    return entries[:n]
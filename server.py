@@ -0,0 +1,265 @@
+# server.py
+# Headless host that runs many independent game sessions in one process on one asyncio loop.
+#   python server.py --port 7777 --bots 4          serve remote players over TCP (+ 4 autopilot sessions)
+#   python server.py --bench 200 --seconds 10      how many sessions can one core tick at 60/s?
+#
+# Protocol (one ASCII command per line, client -> server):
+#   JOIN <name>      first line, optional (default name "Remote")
+#   L / R / S        hold left / hold right / stop
+#   F                fire once
+#   G <x> <i> <m>    gesture sample: finger_x 0..1, index open 0/1, middle open 0/1
+#   Q                quit
+# Server -> client: "OK <session id>", then "STATE <score> <level> <lives> <ammo>" twice a
+# second and "OVER <score> <level> <played_seconds>" when a game ends (a new one starts).
+import argparse, asyncio, itertools, math, os, signal, time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+import pygame
+from shoot import GameSession, PlayerInput, autopilot_controls, save_score_record, CANNON_KEY_SPEED, FPS, WIDTH, HEIGHT
+
+STATE_EVERY = FPS // 2          # ticks between STATE lines
+MAX_PENDING_OUTPUT = 64 * 1024  # stop sending state to clients that don't read
+
+class Slot:
+    """One hosted session plus where its input comes from (a socket or the autopilot)."""
+    ids = itertools.count(1)
+
+    def __init__(self, name="Bot", writer=None, render=False):
+        self.id = next(self.ids)
+        self.name = name
+        self.writer = writer
+        self.surface = pygame.Surface((WIDTH, HEIGHT)) if render else None
+        self.input = PlayerInput()
+        self.closed = False
+        self.new_game()
+
+    @property
+    def bot(self):
+        return self.writer is None
+
+    def new_game(self):
+        self.session = GameSession([self.name], seed=self.id * 7919 + int(time.time()))
+        self.ticks = 0
+
+    def send(self, line):
+        if self.writer and not self.writer.is_closing() and \
+                self.writer.transport.get_write_buffer_size() < MAX_PENDING_OUTPUT:
+            self.writer.write((line + "\n").encode())
+
+    def tick(self, dt):
+        session = self.session
+        if self.bot:
+            key_dx, fire = autopilot_controls(session, session.cannons[0])
+            inp = PlayerInput(key_dx, fire)
+        else:
+            inp = self.input
+        session.step([inp], dt)
+        self.input.fire = False          # fire is one shot per command
+        self.ticks += 1
+        if self.surface is not None:
+            session.draw(self.surface)
+        if self.ticks % STATE_EVERY == 0:
+            c = session.cannons[0]
+            self.send(f"STATE {c.score} {session.level} {session.lives} {c.ammo}")
+        if session.over:
+            played = int(session.ticks // 1000)
+            self.send(f"OVER {session.score} {session.level} {played}")
+            if not self.bot:
+                save_score_record(self.name, session.score, session.level, played)
+            self.new_game()
+
+    def command(self, line):
+        parts = line.split()
+        if not parts:
+            return
+        cmd = parts[0].upper()
+        if cmd == "L":
+            self.input.key_dx = -CANNON_KEY_SPEED
+        elif cmd == "R":
+            self.input.key_dx = CANNON_KEY_SPEED
+        elif cmd == "S":
+            self.input.key_dx = 0
+        elif cmd == "F":
+            self.input.fire = True
+        elif cmd == "G" and len(parts) == 4:
+            try:
+                x = float(parts[1])
+            except ValueError:
+                return
+            if math.isfinite(x):      # nan/inf would blow up int(finger_x * WIDTH) in Cannon.update
+                self.input.gesture = (min(1.0, max(0.0, x)), parts[2] == "1", parts[3] == "1")
+        elif cmd == "Q":
+            self.closed = True
+
+class SessionHost:
+    """Ticks every slot once per 1/tps seconds on the running event loop.
+
+    Slots are stepped in batches with an `await asyncio.sleep(0)` in between, so socket
+    readers get to run during long ticks instead of waiting for the whole pass.
+    """
+
+    def __init__(self, tps=FPS, batch=16, render=False):
+        self.tps = tps
+        self.batch = batch
+        self.render = render
+        self.slots = []
+        # load stats since the last report
+        self.tick_count = 0
+        self.tick_time = 0.0
+        self.late_ticks = 0
+
+    def add(self, slot):
+        self.slots.append(slot)
+        return slot
+
+    def tick_once(self):
+        """Step every slot once, synchronously. Returns the time it took (s)."""
+        t0 = time.perf_counter()
+        dt = 1000 / self.tps
+        for slot in self.slots:
+            slot.tick(dt)
+        return time.perf_counter() - t0
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        period = 1 / self.tps
+        next_t = loop.time()
+        dt = 1000 / self.tps
+        while True:
+            t0 = time.perf_counter()
+            self.slots = [s for s in self.slots if not s.closed]
+            for i, slot in enumerate(list(self.slots)):
+                try:
+                    slot.tick(dt)
+                except Exception as e:
+                    # one broken session must not stop the others: drop just that slot
+                    print(f"[server] session {slot.id} ({slot.name}) crashed: {type(e).__name__}: {e}")
+                    slot.closed = True
+                    if slot.writer:
+                        slot.writer.close()
+                if i % self.batch == self.batch - 1:
+                    await asyncio.sleep(0)
+            self.tick_time += time.perf_counter() - t0
+            self.tick_count += 1
+            next_t += period
+            delay = next_t - loop.time()
+            if delay < 0:
+                # behind schedule: don't try to catch up with a burst of ticks
+                self.late_ticks += 1
+                next_t = loop.time()
+                delay = 0
+            await asyncio.sleep(delay)
+
+    def report(self):
+        """One-line load summary since the previous call."""
+        n = len(self.slots)
+        if not self.tick_count:
+            return f"{n} sessions"
+        tick_ms = self.tick_time / self.tick_count * 1000
+        budget_ms = 1000 / self.tps
+        line = f"{n} sessions | {tick_ms:.2f} ms/tick ({tick_ms / budget_ms * 100:.0f}% of {budget_ms:.1f} ms) | late ticks {self.late_ticks}"
+        if n:
+            line += f" | capacity ~{int(budget_ms / (tick_ms / n))} sessions/core"
+        self.tick_count = 0
+        self.tick_time = 0.0
+        self.late_ticks = 0
+        return line
+
+# ---------- Networking ----------
+async def handle_client(host, reader, writer):
+    slot = None
+    try:
+        first = (await reader.readline()).decode(errors="replace").strip()
+        name = "Remote"
+        if first.upper().startswith("JOIN"):
+            name = first[4:].strip()[:12] or name
+            first = ""
+        slot = host.add(Slot(name, writer=writer, render=host.render))
+        slot.send(f"OK {slot.id}")
+        slot.command(first)
+        while not slot.closed:
+            line = await reader.readline()
+            if not line:
+                break
+            slot.command(line.decode(errors="replace"))
+    except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+        # ValueError: readline() on a line longer than the stream limit (64 KiB); drop the client
+        pass
+    finally:
+        if slot:
+            slot.closed = True
+        writer.close()
+
+async def serve(args):
+    host = SessionHost(tps=args.tps, render=args.render)
+    for i in range(args.bots):
+        host.add(Slot(f"Bot{i + 1}", render=args.render))
+    server = await asyncio.start_server(lambda r, w: handle_client(host, r, w), args.host, args.port)
+    print(f"[server] listening on {args.host}:{args.port} at {args.tps} ticks/s")
+    # pygame/SDL swallows SIGINT/SIGTERM, so route them to a clean shutdown here
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+    ticker = asyncio.create_task(host.run())
+
+    def ticker_done(task):
+        if not task.cancelled() and task.exception():
+            print(f"[server] ticker stopped: {task.exception()!r}")
+            stop.set()
+    ticker.add_done_callback(ticker_done)
+    try:
+        async with server:
+            while not stop.is_set():
+                try:
+                    await asyncio.wait_for(stop.wait(), args.report)
+                except asyncio.TimeoutError:
+                    print(f"[server] {host.report()}")
+    finally:
+        ticker.cancel()
+    print("[server] stopped")
+
+def bench(args):
+    """Tick N autopilot sessions back-to-back and estimate how many fit in one core at tps."""
+    host = SessionHost(tps=args.tps, render=args.render)
+    for i in range(args.bench):
+        host.add(Slot(f"Bot{i + 1}", render=args.render))
+    host.tick_once()   # warm-up
+    ticks, spent = 0, 0.0
+    end = time.perf_counter() + args.seconds
+    while time.perf_counter() < end:
+        spent += host.tick_once()
+        ticks += 1
+    per_tick_ms = spent / ticks * 1000
+    per_session_us = per_tick_ms * 1000 / args.bench
+    budget_ms = 1000 / args.tps
+    print(f"[bench] {args.bench} sessions{' (rendering)' if args.render else ''}: {per_tick_ms:.2f} ms per tick, "
+          f"{per_session_us:.0f} us per session-tick over {ticks} ticks")
+    print(f"[bench] one core sustains ~{int(budget_ms * 1000 / per_session_us)} sessions at {args.tps} ticks/s "
+          f"({'OK' if per_tick_ms <= budget_ms else 'over budget'} for {args.bench})")
+
+def main():
+    ap = argparse.ArgumentParser(description="Headless multi-session Space Invaders host")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=7777)
+    ap.add_argument("--tps", type=int, default=FPS, help="ticks per second (default 60)")
+    ap.add_argument("--bots", type=int, default=0, help="autopilot sessions to host alongside remote players")
+    ap.add_argument("--render", action="store_true", help="draw every session to its own surface each tick")
+    ap.add_argument("--report", type=float, default=5.0, help="seconds between load reports")
+    ap.add_argument("--bench", type=int, metavar="N", help="benchmark N autopilot sessions and exit")
+    ap.add_argument("--seconds", type=float, default=10.0, help="benchmark duration")
+    args = ap.parse_args()
+    if args.bench:
+        bench(args)
+        return
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 # shoot.py
-import pygame, sys, random, math, time, os, cv2, mediapipe as mp
+import pygame, sys, random, math, time, os, argparse, itertools, functools, cv2, numpy as np, mediapipe as mp
 from datetime import datetime
+from scores import HIGH_SCORE_FILE, save_score_record, load_top_scores
+from audio import AudioManager
 
 # ---------- Init ----------
 pygame.init()
@@ -29,10 +31,25 @@ ASSETS = {
     "bg_music": "assets/background_music.mp3"
 }
 
-HIGH_SCORE_FILE = "high_score.txt"
+CLIPS_DIR = "clips"
+AUDIO_CACHE_DIR = ".audio_cache"
 
-# ---------- Audio Control ----------
-is_muted = False
+# Mixer channels reserved per sound effect (max overlapping voices)
+SFX_VOICES = {
+    "shoot": 2,
+    "explosion": 3,
+    "hit": 1,
+    "powerup": 1
+}
+
+# ---------- Clip recorder (enabled with --record) ----------
+recorder = None
+
+# ---------- Telemetry writer (enabled with --telemetry) ----------
+telemetry = None
+
+# ---------- Global leaderboard sync (enabled with --leaderboard) ----------
+leaderboard = None
 
 # ---------- Window ----------
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
@@ -64,12 +81,6 @@ def load_image(path, size=None):
         surf.fill((120, 120, 120, 255))
         return surf
 
-def load_sound(path):
-    try:
-        return pygame.mixer.Sound(path)
-    except Exception:
-        return None
-
 # Preload simple assets (sizes chosen to look good)
 background = load_image(ASSETS["background"], (WIDTH, HEIGHT))
 cannon_img = load_image(ASSETS["cannon"], (72, 48))
@@ -87,18 +98,10 @@ powerup_imgs = {
     "shield": load_image(ASSETS["powerup_shield"], (36, 36))
 }
 
-# Load sounds
-shoot_sfx = load_sound(ASSETS["shoot_sfx"])
-explosion_sfx = load_sound(ASSETS["explosion_sfx"])
-hit_sfx = load_sound(ASSETS["hit_sfx"])
-powerup_sfx = load_sound(ASSETS["powerup_sfx"])
-
-# Background music (optional)
-try:
-    pygame.mixer.music.load(ASSETS["bg_music"])
-    pygame.mixer.music.play(-1)
-except Exception:
-    pass
+# ---------- Audio Control ----------
+# Sound effects come from the PCM cache; background music streams and starts in main() (optional)
+audio = AudioManager(AUDIO_CACHE_DIR)
+audio.load({name: (ASSETS[f"{name}_sfx"], voices) for name, voices in SFX_VOICES.items()})
 
 # ---------- Icons (must be loaded before game loop runs) ----------
 mute_icon = load_image("assets/mute.png", (32, 32))
@@ -106,21 +109,10 @@ unmute_icon = load_image("assets/unmute.png", (32, 32))
 
 def set_audio_volume(vol: float):
     """Set volume for music and sfx safely (0.0 - 1.0)."""
-    try:
-        pygame.mixer.music.set_volume(vol)
-    except:
-        pass
-    for s in (shoot_sfx, explosion_sfx, hit_sfx, powerup_sfx):
-        try:
-            if s:
-                s.set_volume(vol)
-        except:
-            pass
+    audio.set_volume(vol)
 
 def toggle_mute():
-    global is_muted
-    is_muted = not is_muted
-    set_audio_volume(0.0 if is_muted else 1.0)
+    audio.toggle_mute()
 
 # ---------- Game constants ----------
 BULLET_SPEED = -12
@@ -132,56 +124,30 @@ START_LIVES = 3
 POWERUP_SPEED = 6      # falling powerups speed
 STRONG_ALIEN_HP = 4    # strong alien needs 4 hits
 MAX_ALIENS = 5         # cap
+MAX_ALIEN_BULLETS = 6  # alien bullets on screen at once (not capped in stress mode)
+STRESS_WAVE_GROWTH = 8 # stress mode: extra aliens per level, without upper limit
 
 # Ensure high score file exists
 if not os.path.exists(HIGH_SCORE_FILE):
     open(HIGH_SCORE_FILE, "w").close()
 
-def save_score_record(name, score, level, played_seconds):
-    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    line = f"{ts}|{name}|{score}|{level}|{played_seconds}\n"
-    try:
-        with open(HIGH_SCORE_FILE, "a", encoding="utf-8") as f:
-            f.write(line)
-    except Exception:
-        pass
-
-def load_top_scores(n=5):
-    entries = []
-    try:
-        with open(HIGH_SCORE_FILE, "r", encoding="utf-8") as f:
-            for ln in f:
-                ln = ln.strip()
-                if not ln:
-                    continue
-                parts = ln.split("|")
-                if len(parts) != 5:
-                    continue
-                ts, name, score_s, level_s, played_s = parts
-                try:
-                    score = int(score_s)
-                except:
-                    score = 0
-                try:
-                    played = int(played_s)
-                except:
-                    played = 9999
-                entries.append((name, score, ts, level_s, played))
-    except Exception:
-        pass
-
-    # Sort by score DESC, time ASC (shorter is better), date DESC (recent first)
-    entries.sort(key=lambda e: (-e[1], e[4], -int(datetime.strptime(e[2], "%Y-%m-%d %H:%M:%S").timestamp()) if e[2] else 0))
-    return entries[:n]
-
 # ---------- Sprites ----------
+# Sprites that need the game clock or the session's groups take the owning GameSession.
 class Cannon(pygame.sprite.Sprite):
-    def __init__(self):
+    def __init__(self, session, x=WIDTH // 2, name="Player", player=0):
         super().__init__()
+        self.session = session
         self.image = cannon_img
-        self.rect = self.image.get_rect(midbottom=(WIDTH // 2, HEIGHT - 12))
+        self.rect = self.image.get_rect(midbottom=(x, HEIGHT - 12))
         self.shield = False
         self.shield_timer = 0
+        # per-player state
+        self.name = name
+        self.player = player
+        self.score = 0
+        self.ammo = MAX_AMMO
+        self.bullets = pygame.sprite.Group()   # this player's bullets in flight
+        self.shot_locked = False               # prevents repeated shots while fingers remain open
 
     def update(self, finger_x=None, key_dx=0):
         # keyboard move
@@ -197,15 +163,16 @@ class Cannon(pygame.sprite.Sprite):
         if self.rect.right > WIDTH:
             self.rect.right = WIDTH
         # shield timeout
-        if self.shield and pygame.time.get_ticks() - self.shield_timer > 5000:
+        if self.shield and self.session.ticks - self.shield_timer > 5000:
             self.shield = False
 
 class PlayerBullet(pygame.sprite.Sprite):
-    def __init__(self, x, y):
+    def __init__(self, x, y, owner=None):
         super().__init__()
         self.image = bullet_img
         self.rect = self.image.get_rect(midbottom=(x, y))
         self.vy = BULLET_SPEED
+        self.owner = owner
 
     def update(self):
         self.rect.y += self.vy
@@ -225,8 +192,9 @@ class AlienBullet(pygame.sprite.Sprite):
             self.kill()
 
 class Alien(pygame.sprite.Sprite):
-    def __init__(self, x, y, typ="small", fire_enabled=False, strong=False):
+    def __init__(self, session, x, y, typ="small", fire_enabled=False, strong=False):
         super().__init__()
+        self.session = session
         self.typ = typ
         self.strong = strong
         if strong:
@@ -240,10 +208,10 @@ class Alien(pygame.sprite.Sprite):
         self.max_hp = STRONG_ALIEN_HP if strong else {"small": 1, "medium": 2, "big": 3}.get(typ, 1)
         self.hp = self.max_hp
         self.t = 0.0
-        self.path = random.choice(["sine", "zigzag", "random"])
+        self.path = session.rng.choice(["sine", "zigzag", "random"])
         self.fire_enabled = fire_enabled
-        self.shoot_delay = random.randint(1800, 3800)
-        self.last_shot = pygame.time.get_ticks()
+        self.shoot_delay = session.rng.randint(1800, 3800)
+        self.last_shot = session.ticks
 
     def update(self):
         self.t += 0.08
@@ -255,7 +223,7 @@ class Alien(pygame.sprite.Sprite):
                 self.rect.x += int(3 * math.sin(self.t * 5))
                 self.rect.y += 0.06
             else:
-                self.rect.x += random.choice([-2, 0, 2])
+                self.rect.x += self.session.rng.choice([-2, 0, 2])
                 self.rect.y += 0.06
         # clamp
         if self.rect.left < 0:
@@ -263,11 +231,13 @@ class Alien(pygame.sprite.Sprite):
         if self.rect.right > WIDTH:
             self.rect.right = WIDTH
         # shooting only if enabled (allowed only after level 5)
-        if self.fire_enabled and len(alien_bullets) < 6 and not self.strong:
-            now = pygame.time.get_ticks()
+        session = self.session
+        cap = session.alien_bullet_cap
+        if self.fire_enabled and (cap is None or len(session.alien_bullets) < cap) and not self.strong:
+            now = session.ticks
             if now - self.last_shot > self.shoot_delay:
                 ab = AlienBullet(self.rect.centerx, self.rect.bottom)
-                all_sprites.add(ab); alien_bullets.add(ab)
+                session.all_sprites.add(ab); session.alien_bullets.add(ab)
                 self.last_shot = now
 
     def draw_health(self, surf):
@@ -279,13 +249,13 @@ class Alien(pygame.sprite.Sprite):
         pygame.draw.rect(surf, GREEN, (self.rect.x, self.rect.y - 10, fill, h))
 
 class StrongAlien(Alien):
-    def __init__(self, y=80, speed=4):
-        super().__init__(0, y, typ="big", fire_enabled=False, strong=True)
+    def __init__(self, session, y=80, speed=4):
+        super().__init__(session, 0, y, typ="big", fire_enabled=False, strong=True)
         # set image rect again if we used a different image
         if alien_life_img:
             self.image = alien_life_img
             self.rect = self.image.get_rect(topleft=(0, y))
-        self.vx = speed if random.choice([True, False]) else -speed
+        self.vx = speed if session.rng.choice([True, False]) else -speed
         # start off-screen accordingly
         if self.vx > 0:
             self.rect.left = -self.rect.width
@@ -293,7 +263,7 @@ class StrongAlien(Alien):
             self.rect.right = WIDTH + self.rect.width
 
         # lifespan (ms)
-        self.spawn_time = pygame.time.get_ticks()
+        self.spawn_time = session.ticks
         self.lifespan = 15000  # 15 seconds
 
     def update(self):
@@ -307,19 +277,20 @@ class StrongAlien(Alien):
             self.vx = -self.vx
 
         # remove after lifespan
-        if pygame.time.get_ticks() - self.spawn_time > self.lifespan:
+        if self.session.ticks - self.spawn_time > self.lifespan:
             self.kill()
 
 class Explosion(pygame.sprite.Sprite):
-    def __init__(self, pos):
+    def __init__(self, session, pos):
         super().__init__()
+        self.session = session
         self.image = explosion_img
         self.rect = self.image.get_rect(center=pos)
-        self.start = pygame.time.get_ticks()
+        self.start = session.ticks
         self.duration = 300
 
     def update(self):
-        if pygame.time.get_ticks() - self.start > self.duration:
+        if self.session.ticks - self.start > self.duration:
             self.kill()
 
 class PowerUp(pygame.sprite.Sprite):
@@ -334,59 +305,331 @@ class PowerUp(pygame.sprite.Sprite):
         if self.rect.top > HEIGHT:
             self.kill()
 
-# ---------- Groups ----------
-all_sprites = pygame.sprite.Group()
-player_bullets = pygame.sprite.Group()
-aliens = pygame.sprite.Group()
-alien_bullets = pygame.sprite.Group()
-powerups = pygame.sprite.Group()
-explosions = pygame.sprite.Group()
+# ---------- Game session ----------
+class PlayerInput:
+    """One player's controls for a single tick."""
+
+    def __init__(self, key_dx=0, fire=False, gesture=None):
+        self.key_dx = key_dx
+        self.fire = fire          # shot requested this tick (key press / autopilot)
+        self.gesture = gesture    # (finger_x, index_open, middle_open) or None
+
+class GameSession:
+    """Everything one game needs: sprite groups, players, level, lives and its own clock.
+
+    A session never reads the display, webcam or module-level state, so any number of
+    them can run in one process. step() advances one tick from per-player inputs and
+    draw() renders onto any surface. `ticks` is the game clock in ms; it only moves
+    inside step(), so a paused or throttled session doesn't age its timers.
+
+    With stress=True the game is endless: levels spawn formation waves that keep
+    growing (see formation_layout), alien fire is uncapped, and lives and ammo never run out.
+    """
+
+    def __init__(self, player_names, telemetry=None, audio=None, seed=None, stress=False):
+        self.rng = random.Random(seed)
+        self.stress = stress
+        self.alien_bullet_cap = None if stress else MAX_ALIEN_BULLETS
+        self.telemetry = telemetry
+        self.audio = audio
+        self.ticks = 0
+        self.all_sprites = pygame.sprite.Group()
+        self.player_bullets = pygame.sprite.Group()
+        self.aliens = pygame.sprite.Group()
+        self.alien_bullets = pygame.sprite.Group()
+        self.powerups = pygame.sprite.Group()
+        self.explosions = pygame.sprite.Group()
+
+        n = len(player_names)
+        self.cannons = [Cannon(self, x=WIDTH * (i + 1) // (n + 1), name=name, player=i)
+                        for i, name in enumerate(player_names)]
+        self.all_sprites.add(*self.cannons)
+        self.level = 1
+        self.lives = START_LIVES
+        # spawn aliens
+        create_aliens(self, self.level)
+        if telemetry:
+            telemetry.game(n)
+
+    def sound(self, name):
+        if self.audio:
+            self.audio.play(name)
+
+    @property
+    def score(self):
+        return sum(c.score for c in self.cannons)
+
+    @property
+    def over(self):
+        if self.stress:
+            return False
+        out_of_ammo = all(c.ammo <= 0 for c in self.cannons) and len(self.player_bullets) == 0
+        return self.lives <= 0 or out_of_ammo
+
+    def step(self, inputs, dt=1000 / FPS):
+        """Advance the game by one tick of dt ms. inputs holds one PlayerInput per cannon."""
+        self.ticks += dt
+        tlm = self.telemetry
+
+        # ---------- Shooting (keys / autopilot / gestures) ----------
+        for c, inp in zip(self.cannons, inputs):
+            if self.stress:
+                c.ammo = MAX_AMMO
+            if inp.fire:
+                fire_bullet(self, c)
+            finger_x, index_open, middle_open = inp.gesture or (None, False, False)
+            if inp.gesture and tlm:
+                tlm.gesture(c.player, finger_x, index_open, middle_open)
+            if index_open and middle_open and not c.shot_locked:
+                fire_bullet(self, c)
+                c.shot_locked = True
+            if not index_open and not middle_open:
+                c.shot_locked = False
+
+        # ---------- Update sprites ----------
+        for spr in list(self.all_sprites):
+            if isinstance(spr, Cannon):
+                continue
+            spr.update()
+        for c, inp in zip(self.cannons, inputs):
+            c.update(finger_x=inp.gesture[0] if inp.gesture else None, key_dx=inp.key_dx)
+
+        self.player_bullets.update()
+        self.alien_bullets.update()
+        self.explosions.update()
+        self.powerups.update()
+
+        # ---------- Collisions ----------
+        hits = pygame.sprite.groupcollide(self.player_bullets, self.aliens, True, False)
+        for pb, alist in hits.items():
+            for a in alist:
+                a.hp -= 1
+                if tlm:
+                    tlm.hit(pb.owner.player, a.rect.centerx, a.rect.centery, a.hp)
+                if a.hp <= 0:
+                    exp = Explosion(self, a.rect.center)
+                    self.all_sprites.add(exp); self.explosions.add(exp)
+                    self.sound("explosion")
+                    if getattr(a, "strong", False):
+                        points = 50
+                        self.lives += 1
+                    else:
+                        points = 10 * (1 if a.typ == "small" else 2)
+                    pb.owner.score += points
+                    if tlm:
+                        tlm.kill(pb.owner.player, a.rect.centerx, a.rect.centery, points)
+                    if self.rng.random() < 0.25:
+                        kind = self.rng.choice(["ammo", "shield"]) if (self.level > 5) else "ammo"
+                        pu = PowerUp(kind, a.rect.centerx, a.rect.centery)
+                        self.all_sprites.add(pu); self.powerups.add(pu)
+                    a.kill()
+
+        for c in self.cannons:
+            hits2 = pygame.sprite.spritecollide(c, self.alien_bullets, True)
+            if hits2:
+                if tlm:
+                    tlm.player_hit(c.player, c.rect.centerx, c.rect.centery, c.shield)
+                if not c.shield:
+                    if not self.stress:
+                        self.lives -= 1
+                    exp = Explosion(self, c.rect.center)
+                    self.all_sprites.add(exp); self.explosions.add(exp)
+                    self.sound("hit")
+                else:
+                    c.shield = False
+
+            p_hits = pygame.sprite.spritecollide(c, self.powerups, True)
+            for pu in p_hits:
+                self.sound("powerup")
+                if tlm:
+                    tlm.powerup(c.player, pu.rect.centerx, pu.rect.centery, pu.kind)
+                if pu.kind == "ammo":
+                    c.ammo += 5
+                elif pu.kind == "shield":
+                    if self.level > 5:
+                        c.shield = True
+                        c.shield_timer = self.ticks
+
+        # ---------- Level progression ----------
+        if len(self.aliens) == 0:
+            self.next_level()
+
+        if tlm:
+            tlm.state(self.lives, self.level, [c.ammo for c in self.cannons])
+            tlm.frame(dt, len(self.aliens), len(self.alien_bullets), len(self.player_bullets), len(self.all_sprites))
+
+    def next_level(self):
+        self.level += 1
+        for c in self.cannons:
+            c.ammo = MAX_AMMO
+        create_aliens(self, self.level)
+        if not self.stress:
+            for a in list(self.aliens):
+                if not getattr(a, "strong", False):
+                    a.fire_enabled = (self.level > 5)
+
+    def draw(self, surf):
+        surf.blit(background, (0, 0))
+        for s in self.all_sprites:
+            surf.blit(s.image, s.rect)
+        for a in self.aliens:
+            a.draw_health(surf)
+        draw_hud(surf, self)
+        multi = len(self.cannons) > 1
+        for i, c in enumerate(self.cannons):
+            if c.shield:
+                pygame.draw.circle(surf, BLUE, c.rect.center, 42, 3)
+            if multi:
+                tag = SMALL_FONT.render(f"P{i + 1}", True, YELLOW)
+                surf.blit(tag, (c.rect.centerx - tag.get_width() // 2, c.rect.top - 16))
 
 # ---------- Helpers ----------
-def create_aliens(level):
+def fire_bullet(session, cannon):
+    """Spawn a bullet for this cannon if it has ammo and none in flight. Returns True when a shot was fired."""
+    if cannon.ammo <= 0 or len(cannon.bullets) != 0:
+        return False
+    b = PlayerBullet(cannon.rect.centerx, cannon.rect.top, owner=cannon)
+    session.all_sprites.add(b); session.player_bullets.add(b); cannon.bullets.add(b)
+    cannon.ammo -= 1
+    session.sound("shoot")
+    if session.telemetry:
+        session.telemetry.shot(cannon.player, b.rect.centerx, b.rect.bottom)
+    return True
+
+def autopilot_controls(session, cannon):
+    """Pick (key_dx, fire) for unattended play: chase the lowest alien, dodge close bullets."""
+    target = None
+    for a in session.aliens:
+        if target is None or a.rect.bottom > target.rect.bottom:
+            target = a
+    key_dx = 0
+    fire = False
+    if target is not None:
+        dx = target.rect.centerx - cannon.rect.centerx
+        if abs(dx) > CANNON_KEY_SPEED:
+            key_dx = CANNON_KEY_SPEED if dx > 0 else -CANNON_KEY_SPEED
+        fire = abs(dx) < target.rect.width // 2
+    for ab in session.alien_bullets:
+        if ab.rect.bottom > cannon.rect.top - 120 and abs(ab.rect.centerx - cannon.rect.centerx) < cannon.rect.width:
+            key_dx = -CANNON_KEY_SPEED if ab.rect.centerx >= cannon.rect.centerx else CANNON_KEY_SPEED
+            break
+    return key_dx, fire
+
+def save_clip():
+    if recorder:
+        recorder.save(os.path.join(CLIPS_DIR, datetime.now().strftime("clip-%Y%m%d-%H%M%S.mp4")))
+
+def create_aliens(session, level):
+    if session.stress:
+        return create_wave(session, level)
+    rng = session.rng
     n = min(1 + level, MAX_ALIENS)
     new_aliens = []
     for i in range(n):
-        x = random.randint(40, WIDTH - 140)
-        y = random.randint(40, 140)
-        typ = random.choice(["small", "medium", "big"])
+        x = rng.randint(40, WIDTH - 140)
+        y = rng.randint(40, 140)
+        typ = rng.choice(["small", "medium", "big"])
         fire = (level > 5)
-        a = Alien(x, y, typ, fire_enabled=fire, strong=False)
-        aliens.add(a); all_sprites.add(a)
+        a = Alien(session, x, y, typ, fire_enabled=fire, strong=False)
+        session.aliens.add(a); session.all_sprites.add(a)
         new_aliens.append(a)
     # spawn extra-life strong alien every 2 stages
     if level % 2 == 0:
-        sa = StrongAlien(y=random.randint(50, 120), speed=4)
-        aliens.add(sa); all_sprites.add(sa)
+        sa = StrongAlien(session, y=rng.randint(50, 120), speed=4)
+        session.aliens.add(sa); session.all_sprites.add(sa)
+        new_aliens.append(sa)
+    return new_aliens
+
+# ---------- Stress mode formation waves ----------
+FORMATIONS = ("grid", "columns", "swarm")
+
+def wave_size(level):
+    return STRESS_WAVE_GROWTH * level
+
+@functools.lru_cache(maxsize=2)
+def formation_layout(level):
+    """Spawn layout for a stress-mode level: (formation, ((x, y, typ, fire_enabled, path), ...)).
+    Deterministic per level and cached for the current and next level (an endless run would
+    otherwise keep every wave), so a wave costs only the sprite construction."""
+    formation = FORMATIONS[(level - 1) % len(FORMATIONS)]
+    n = wave_size(level)
+    left, top = 20, 40
+    area_w, area_h = WIDTH - 110, HEIGHT // 2 - 40
+    rng = random.Random(level)
+    slots = []
+    if formation == "grid":
+        # as square as the area allows; spacing shrinks (and aliens overlap) as the wave grows
+        cols = max(1, min(n, round(math.sqrt(n * area_w / area_h))))
+        rows = math.ceil(n / cols)
+        for i in range(n):
+            r, col = divmod(i, cols)
+            typ = ("big", "medium", "small")[min(2, r * 3 // rows)]
+            x = left + int(col * area_w / cols)
+            y = top + int(r * area_h / rows)
+            slots.append((x, y, typ, r % 2 == 0, "sine"))
+    elif formation == "columns":
+        cols = max(3, math.ceil(math.sqrt(n) / 2))
+        per_col = math.ceil(n / cols)
+        for i in range(n):
+            col, r = divmod(i, per_col)
+            x = left + int((col + 0.5) * area_w / cols)
+            y = top + int(r * area_h / per_col)
+            slots.append((x, y, "medium", True, "zigzag"))
+    else:
+        centers = [(rng.randint(left, left + area_w), rng.randint(top, top + area_h))
+                   for _ in range(math.ceil(n / 40))]
+        for i in range(n):
+            cx, cy = centers[i % len(centers)]
+            x = min(max(int(rng.gauss(cx, 60)), left), left + area_w)
+            y = min(max(int(rng.gauss(cy, 40)), top), top + area_h)
+            slots.append((x, y, "small", rng.random() < 0.66, "random"))
+    return formation, tuple(slots)
+
+def create_wave(session, level):
+    formation, slots = formation_layout(level)
+    new_aliens = []
+    for x, y, typ, fire, path in slots:
+        a = Alien(session, x, y, typ, fire_enabled=fire, strong=False)
+        a.path = path
+        new_aliens.append(a)
+    session.aliens.add(*new_aliens); session.all_sprites.add(*new_aliens)
+    if level % 2 == 0:
+        sa = StrongAlien(session, y=session.rng.randint(50, 120), speed=4)
+        session.aliens.add(sa); session.all_sprites.add(sa)
         new_aliens.append(sa)
     return new_aliens
 
-def draw_hud(name, score, level, lives, ammo, start_time, elapsed_pause_time=0):
+def draw_hud(surf, session):
+    cannons = session.cannons
     # Player name and Score
-    screen.blit(FONT.render(f"Player: {name}", True, WHITE), (12, 8))
-    screen.blit(FONT.render(f"Score: {score}", True, WHITE), (12, 36))
-    screen.blit(FONT.render(f"Level: {level}", True, WHITE), (WIDTH - 150, 8))
+    if len(cannons) == 1:
+        surf.blit(FONT.render(f"Player: {cannons[0].name}", True, WHITE), (12, 8))
+        surf.blit(FONT.render(f"Score: {cannons[0].score}", True, WHITE), (12, 36))
+    else:
+        for i, c in enumerate(cannons):
+            surf.blit(FONT.render(f"P{i + 1} {c.name}: {c.score}", True, WHITE), (12, 8 + 28 * i))
+    surf.blit(FONT.render(f"Level: {session.level}", True, WHITE), (WIDTH - 150, 8))
 
     # Lives and Ammo horizontally side by side
-    lives_text = FONT.render(f"Lives: {lives}", True, RED)
-    ammo_text = FONT.render(f"Ammo: {ammo}", True, GREEN)
+    lives_text = FONT.render(f"Lives: {session.lives}", True, RED)
+    ammo_text = FONT.render("Ammo: " + " | ".join(str(c.ammo) for c in cannons), True, GREEN)
 
     # Positions
     lives_x = WIDTH // 2 - lives_text.get_width() - 10
     ammo_x = WIDTH // 2 + 10
     top_y = 8
 
-    screen.blit(lives_text, (lives_x, top_y))
-    screen.blit(ammo_text, (ammo_x, top_y))
+    surf.blit(lives_text, (lives_x, top_y))
+    surf.blit(ammo_text, (ammo_x, top_y))
 
-    # Time below lives and ammo
-    played = int(time.time() - start_time - elapsed_pause_time)
+    # Time below lives and ammo (game clock, so pauses don't count)
+    played = int(session.ticks // 1000)
     time_text = FONT.render(f"Time: {time.strftime('%M:%S', time.gmtime(played))}", True, WHITE)
     time_x = WIDTH // 2 - time_text.get_width() // 2
     time_y = top_y + lives_text.get_height() + 4
-    screen.blit(time_text, (time_x, time_y))
+    surf.blit(time_text, (time_x, time_y))
 
-def get_player_name_screen():
+def get_player_name_screen(prompt_text="Enter your name", default="Player"):
     name = ""
     active = True
     blink = True
@@ -401,7 +644,7 @@ def get_player_name_screen():
             blink = not blink  # toggle cursor visibility
 
         screen.fill(BLACK)
-        prompt = BIG_FONT.render("Enter your name", True, YELLOW)
+        prompt = BIG_FONT.render(prompt_text, True, YELLOW)
         screen.blit(prompt, (WIDTH // 2 - prompt.get_width() // 2, HEIGHT // 2 - 120))
 
         box = pygame.Rect(WIDTH // 2 - 220, HEIGHT // 2 - 20, 440, 48)
@@ -434,45 +677,285 @@ def get_player_name_screen():
                     if len(name) < 12 and ev.unicode.isprintable():
                         name += ev.unicode
 
-    return name.strip() or "Player"
+    return name.strip() or default
 
 
-def cleanup_and_quit():
-    try:
-        if 'hands' in globals() and hands:
-            hands.close()
-    except:
-        pass
+def shutdown():
+    """Close every optional subsystem and the camera. Safe to call more than once; every
+    exit path goes through here, so a new subsystem only needs adding in one place."""
+    global cap
+    for name in ("recorder", "leaderboard", "telemetry", "hands"):
+        obj = globals().get(name)
+        globals()[name] = None
+        try:
+            if obj:
+                obj.close()
+        except:
+            pass
     try:
-        if 'cap' in globals() and cap and cap.isOpened():
+        if cap and cap.isOpened():
             cap.release()
         cv2.destroyAllWindows()
     except:
         pass
-    try:
-        pygame.mixer.music.stop()
-    except:
-        pass
+    cap = None
+
+def cleanup_and_quit():
+    shutdown()
+    audio.stop()
     pygame.quit()
     sys.exit()
 
 # ---------- MediaPipe (gesture) ----------
 mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(max_num_hands=1, min_detection_confidence=0.5, min_tracking_confidence=0.5)
 
-# Initialize webcam safely
+def make_hands(max_hands=1):
+    return mp_hands.Hands(max_num_hands=max_hands, min_detection_confidence=0.5, min_tracking_confidence=0.5)
+
+# Webcam and hands model are opened by init_gesture() from main(), so importing this
+# module (soak runs, headless servers) never grabs the camera.
+hands = None
 cap = None
-try:
-    cap = cv2.VideoCapture(0)
-    if not cap.isOpened():
-        cap.release()
-        cap = None
-except Exception:
+camera = None
+inference_stats = {"frames": 0, "seconds": 0.0}   # hands.process timing
+
+class CameraStage:
+    """Webcam capture into reusable buffers.
+
+    cap.read(image=...) refills the same BGR array every frame, and the RGB image for
+    MediaPipe is converted into a second persistent array. The picture is not mirrored;
+    hand_gesture(mirror=True) flips landmark x instead, and MIRRORED_LABEL swaps the
+    handedness to what the mirrored image would have reported.
+    """
+
+    def __init__(self, cap):
+        self.cap = cap
+        self.bgr = None
+        self.rgb = None
+        self.frames = 0
+        self.allocations = 0     # buffer (re)allocations; only the first frame or a size change
+        self.seconds = 0.0       # colour conversion time (not the wait for the camera)
+
+    def read(self):
+        """Return the RGB buffer holding the next frame (valid until the next read), or None."""
+        if self.bgr is None:
+            ret, frame = self.cap.read()
+        else:
+            ret, frame = self.cap.read(image=self.bgr)
+        if not ret or frame is None:
+            return None
+        if frame is not self.bgr:
+            self.bgr = frame
+            self.allocations += 1
+        if self.rgb is None or self.rgb.shape != self.bgr.shape:
+            self.rgb = np.empty_like(self.bgr)
+            self.allocations += 1
+        t0 = time.perf_counter()
+        self.convert()
+        self.frames += 1
+        self.seconds += time.perf_counter() - t0
+        return self.rgb
+
+    def convert(self):
+        """Refresh the RGB buffer from the current BGR frame."""
+        self.rgb.flags.writeable = True
+        cv2.cvtColor(self.bgr, cv2.COLOR_BGR2RGB, dst=self.rgb)
+        # read-only lets MediaPipe wrap the array instead of copying it
+        self.rgb.flags.writeable = False
+
+    def stats(self):
+        if not self.frames:
+            return {"frames": 0}
+        return {"frames": self.frames,
+                "allocations_per_frame": round(self.allocations / self.frames, 4),
+                "ms_per_frame": round(self.seconds / self.frames * 1000, 3)}
+
+def init_gesture(max_hands=1):
+    global hands, cap, camera
+    hands = make_hands(max_hands)
+    # Initialize webcam safely
     cap = None
+    try:
+        cap = cv2.VideoCapture(0)
+        if not cap.isOpened():
+            cap.release()
+            cap = None
+    except Exception:
+        cap = None
+    camera = CameraStage(cap) if cap is not None else None
+
+MIRRORED_LABEL = {"Left": "Right", "Right": "Left"}
+
+def hand_gesture(hl, mirror=False):
+    """(finger_x, index_open, middle_open) for one hand's landmarks."""
+    idx_tip = hl.landmark[8]; idx_pip = hl.landmark[6]
+    mid_tip = hl.landmark[12]; mid_pip = hl.landmark[10]
+    finger_x = 1.0 - idx_tip.x if mirror else idx_tip.x
+    return finger_x, (idx_tip.y < idx_pip.y - 0.02), (mid_tip.y < mid_pip.y - 0.02)
+
+def read_gestures(res, mirror=False):
+    """[(handedness, gesture), ...] for every hand in a hands.process result."""
+    if not res.multi_hand_landmarks:
+        return []
+    labels = res.multi_handedness or []
+    found = []
+    for i, hl in enumerate(res.multi_hand_landmarks):
+        label = labels[i].classification[0].label if i < len(labels) else None
+        if mirror:
+            label = MIRRORED_LABEL.get(label, label)
+        found.append((label, hand_gesture(hl, mirror)))
+    return found
+
+def detect_hands():
+    """Read one webcam frame and run a single hands.process pass.
+    Returns [(handedness, gesture), ...] for every detected hand."""
+    if camera is None:
+        return []
+    rgb = camera.read()
+    if rgb is None:
+        return []
+    try:
+        t0 = time.perf_counter()
+        res = hands.process(rgb)
+        inference_stats["frames"] += 1
+        inference_stats["seconds"] += time.perf_counter() - t0
+        return read_gestures(res, mirror=True)
+    except Exception:
+        return []
+
+def benchmark_capture(n_frames=120):
+    """Compare the old flip + convert path with CameraStage on live webcam frames:
+    preprocessing time, buffer allocations and whether both give the same gestures."""
+    if camera is None:
+        print("[bench] no webcam available")
+        return
+    old_hands, new_hands = make_hands(1), make_hands(1)
+    old_t = new_t = 0.0
+    old_n = new_n = 0
+    compared = matched = 0
+    max_dx = 0.0
+    for i in range(n_frames):
+        # cap.read() blocks until the camera's next frame, so only the preprocessing of an
+        # already-read frame is timed, for both paths on the same pixels
+        if camera.read() is None:
+            break
+        t0 = time.perf_counter()
+        old_rgb = cv2.cvtColor(cv2.flip(camera.bgr, 1), cv2.COLOR_BGR2RGB)
+        old_t += time.perf_counter() - t0
+        t0 = time.perf_counter()
+        camera.convert()
+        new_t += time.perf_counter() - t0
+        old_n = new_n = i + 1
+        # compare what the game would see from each path
+        old = read_gestures(old_hands.process(old_rgb))
+        new = read_gestures(new_hands.process(camera.rgb), mirror=True)
+        if old or new:
+            compared += 1
+            if len(old) == len(new) and all(o[0] == n[0] and o[1][1:] == n[1][1:] for o, n in zip(old, new)):
+                matched += 1
+                max_dx = max([max_dx] + [abs(o[1][0] - n[1][0]) for o, n in zip(old, new)])
+    old_hands.close(); new_hands.close()
+    if not old_n or not new_n:
+        print("[bench] could not read webcam frames")
+        return
+    old_ms = old_t / old_n * 1000
+    new_ms = new_t / new_n * 1000
+
+    # Allocations, measured the same way for both paths in a separate pass (tracing slows the timings):
+    # the peak of newly allocated bytes while preprocessing one frame, in frame-sized buffers.
+    import tracemalloc
+    def old_path():
+        ret, frame = cap.read()
+        return cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB) if ret else None
+    frame_bytes = camera.bgr.nbytes
+    old_alloc = new_alloc = 0
+    tracemalloc.start()
+    try:
+        for _ in range(10):
+            for path in (old_path, camera.read):
+                before = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                path()
+                grew = tracemalloc.get_traced_memory()[1] - before
+                if path is old_path:
+                    old_alloc += grew
+                else:
+                    new_alloc += grew
+    finally:
+        tracemalloc.stop()
+    for label, ms, grew in (("flip + convert:", old_ms, old_alloc), ("CameraStage:   ", new_ms, new_alloc)):
+        print(f"[bench] {label} {ms:.3f} ms/frame, peak new memory {grew / 10 / 1024:.0f} KB/frame "
+              f"({grew / 10 / frame_bytes:.1f} frame buffers)")
+    print(f"[bench] CameraStage saves {old_ms - new_ms:.3f} ms/frame")
+    print(f"[bench] gestures matched on {matched}/{compared} frames with hands (max finger_x difference {max_dx:.4f})")
+
+class HandTracker:
+    """Keeps each player on the same hand across frames.
+
+    Every slot remembers the last x position and handedness of its hand (slots start
+    spread evenly left to right). Each frame the detected hands are matched to slots
+    by the assignment with the smallest total movement, with a penalty for a
+    handedness change.
+    """
+    LABEL_PENALTY = 0.5
+
+    def __init__(self, slots):
+        self.slots = slots
+        self.last_x = [(i + 0.5) / slots for i in range(slots)]
+        self.labels = [None] * slots
+
+    def assign(self, detections):
+        """Map [(handedness, gesture), ...] to a per-slot list of gestures (None = no hand)."""
+        out = [None] * self.slots
+        if not detections:
+            return out
+        detections = detections[:self.slots]
+        best, best_cost = None, None
+        for perm in itertools.permutations(range(self.slots), len(detections)):
+            cost = 0.0
+            for (label, g), slot in zip(detections, perm):
+                cost += abs(g[0] - self.last_x[slot])
+                if self.labels[slot] and label and label != self.labels[slot]:
+                    cost += self.LABEL_PENALTY
+            if best_cost is None or cost < best_cost:
+                best, best_cost = perm, cost
+        for (label, g), slot in zip(detections, best):
+            out[slot] = g
+            self.last_x[slot] = g[0]
+            self.labels[slot] = label or self.labels[slot]
+        return out
+
+def benchmark_hands(n_frames=120):
+    """Time hands.process with max_num_hands=1 and 2 on the same webcam frames."""
+    if camera is None:
+        print("[bench] no webcam available")
+        return
+    frames = []
+    while len(frames) < n_frames:
+        rgb = camera.read()
+        if rgb is None:
+            break
+        frames.append(rgb.copy())
+    if not frames:
+        print("[bench] could not read webcam frames")
+        return
+    base = None
+    for k in (1, 2):
+        h = make_hands(k)
+        detected = 0
+        t0 = time.perf_counter()
+        for f in frames:
+            res = h.process(f)
+            detected += len(res.multi_hand_landmarks or [])
+        ms = (time.perf_counter() - t0) / len(frames) * 1000
+        h.close()
+        base = base or ms
+        print(f"[bench] max_num_hands={k}: {ms:.2f} ms/frame ({ms / base:.2f}x), {detected} hands over {len(frames)} frames")
 
 # ---------- Game Over UI ----------
-def show_game_over(player_name, score, level, played_seconds):
-    top = load_top_scores(5)
+def show_game_over(results, level, played_seconds):
+    local_top = load_top_scores(5)
+    show_global = False
     showing = True
     star_surf = FONT.render(" * ", True, YELLOW)
 
@@ -501,11 +984,20 @@ def show_game_over(player_name, score, level, played_seconds):
         screen.blit(title_surf, (WIDTH // 2 - title_surf.get_width() // 2, 40))
 
         summary = FONT.render(
-            f"{player_name}  —  Score: {score}   Level: {level}   Time: {played_seconds}s",
+            "   ".join(f"{name}  —  Score: {score}" for name, score in results) + f"   Level: {level}   Time: {played_seconds}s",
             True, WHITE
         )
         screen.blit(summary, (WIDTH // 2 - summary.get_width() // 2, 120))
 
+        # global table comes from the leaderboard client's cache, never from the network
+        top = leaderboard.top(5) if show_global else local_top
+        if leaderboard:
+            label = "GLOBAL TOP 5" if show_global else "THIS CABINET"
+            if show_global and not top:
+                label += "  (not synced yet)"
+            table_title = SMALL_FONT.render(label, True, YELLOW)
+            screen.blit(table_title, (box_x, box_y - table_title.get_height() - 4))
+
         pygame.draw.rect(screen, (40, 40, 40), (box_x, box_y, box_w, box_h))
         pygame.draw.rect(screen, WHITE, (box_x, box_y, box_w, box_h), 2)
 
@@ -515,7 +1007,7 @@ def show_game_over(player_name, score, level, played_seconds):
         y = box_y + 50
         for idx, rec in enumerate(top, start=1):
             name, sc, ts, lvl_rec, played = rec
-            is_current = (name == player_name and sc == score and int(played) == played_seconds)
+            is_current = ((name, sc) in results and int(played) == played_seconds)
 
             if is_current:
                 highlight_rect = pygame.Surface((box_w - 2 * padding_x, row_height - 4), pygame.SRCALPHA)
@@ -537,7 +1029,10 @@ def show_game_over(player_name, score, level, played_seconds):
             if y > box_y + box_h - 28:
                 break
 
-        instr = FONT.render("Press R to Restart or ESC to Quit", True, WHITE)
+        instr_text = "Press R to Restart or ESC to Quit"
+        if leaderboard:
+            instr_text += "   G: " + ("Local Scores" if show_global else "Global Scores")
+        instr = FONT.render(instr_text, True, WHITE)
         screen.blit(instr, (WIDTH // 2 - instr.get_width() // 2, box_y + box_h + 12))
 
         pygame.display.flip()
@@ -550,60 +1045,46 @@ def show_game_over(player_name, score, level, played_seconds):
                     if confirm_quit():
                         cleanup_and_quit()
 
+                if ev.key == pygame.K_g and leaderboard:
+                    show_global = not show_global
+
                 if ev.key == pygame.K_r:
                     showing = False
                     return
 
 # ---------- Main game loop ----------
-def run_game(player_name):
-    global is_muted
-    # reset groups
-    all_sprites.empty(); player_bullets.empty(); aliens.empty(); alien_bullets.empty(); powerups.empty(); explosions.empty()
-
-    cannon = Cannon()
-    all_sprites.add(cannon)
-
-    level = 1
-    score = 0
-    lives = START_LIVES
-    ammo = MAX_AMMO
+def run_game(player_names, autopilot=False, max_seconds=None, fps=FPS):
+    """Play one game with one cannon per name (two names = co-op, shared lives).
+    With autopilot the cannons play themselves, the camera is skipped and nothing is
+    saved; the game also ends after max_seconds. Returns (total score, level, played_seconds)."""
+    session = GameSession(player_names, telemetry=telemetry, audio=audio)
+    n = len(player_names)
+    tracker = HandTracker(n) if n > 1 else None
+
     start_time = time.time()
     # ---------- NEW: Initialize pause tracking ----------
     paused = False
     elapsed_pause_time = 0
-    # spawn aliens
-    create_aliens(level)
 
-    key_dx = 0
-    shot_locked = False   # prevents repeated shots while fingers remain open
+    key_dx = [0] * n
+    # keyboard layout per player: (left, right, fire)
+    key_map = [(pygame.K_LEFT, pygame.K_RIGHT, pygame.K_SPACE), (pygame.K_a, pygame.K_d, pygame.K_w)][:n]
 
+    clock.tick()   # don't count the countdown as the first frame
     running = True
     while running:
-        clock.tick(FPS)
+        frame_ms = clock.tick(fps)
         now = time.time()
 
         # ---------- Webcam + gesture detection ----------
-        finger_x = None
-        index_open = False
-        middle_open = False
-        if cap is not None:
-            ret, frame = cap.read()
-            if ret and frame is not None:
-                frame = cv2.flip(frame, 1)
-                try:
-                    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    res = hands.process(rgb)
-                    if res.multi_hand_landmarks:
-                        hl = res.multi_hand_landmarks[0]
-                        idx_tip = hl.landmark[8]; idx_pip = hl.landmark[6]
-                        mid_tip = hl.landmark[12]; mid_pip = hl.landmark[10]
-                        finger_x = idx_tip.x
-                        index_open = (idx_tip.y < idx_pip.y - 0.02)
-                        middle_open = (mid_tip.y < mid_pip.y - 0.02)
-                except Exception:
-                    finger_x = None
-                    index_open = False
-                    middle_open = False
+        gestures = [None] * n       # (finger_x, index_open, middle_open) per player
+        if not autopilot and camera is not None:
+            found = detect_hands()
+            if tracker:
+                gestures = tracker.assign(found)
+            elif found:
+                gestures[0] = found[0][1]
+        fire = [False] * n
 
         # ---------- Event processing ----------
         for ev in pygame.event.get():
@@ -621,142 +1102,58 @@ def run_game(player_name):
                     # resume
                     paused = False
                     elapsed_pause_time += time.time() - pause_start
+                    clock.tick()   # don't count the pause as one long frame
 
                 if not paused:  # only movement/shooting when not paused
-                    if ev.key == pygame.K_LEFT:
-                        key_dx = -CANNON_KEY_SPEED
-                    if ev.key == pygame.K_RIGHT:
-                        key_dx = CANNON_KEY_SPEED
-                    if ev.key == pygame.K_SPACE:
-                        if ammo > 0 and len(player_bullets) == 0:
-                            b = PlayerBullet(cannon.rect.centerx, cannon.rect.top)
-                            all_sprites.add(b)
-                            player_bullets.add(b)
-                            ammo -= 1
-                            try:
-                                if shoot_sfx and not is_muted:
-                                    shoot_sfx.play()
-                            except:
-                                pass
+                    for i, (k_left, k_right, k_fire) in enumerate(key_map):
+                        if ev.key == k_left:
+                            key_dx[i] = -CANNON_KEY_SPEED
+                        if ev.key == k_right:
+                            key_dx[i] = CANNON_KEY_SPEED
+                        if ev.key == k_fire:
+                            fire[i] = True
                     if ev.key == pygame.K_m:
                         toggle_mute()
+                    if ev.key == pygame.K_F9:
+                        save_clip()
 
             if ev.type == pygame.KEYUP:
                 if not paused:
-                    if ev.key in (pygame.K_LEFT, pygame.K_RIGHT):
-                        key_dx = 0
-
-        # ---------- Gesture shooting logic ----------
-        if not paused:  # freeze gestures while paused
-            if index_open and middle_open and not shot_locked:
-                if ammo > 0 and len(player_bullets) == 0:
-                    b = PlayerBullet(cannon.rect.centerx, cannon.rect.top)
-                    all_sprites.add(b); player_bullets.add(b)
-                    ammo -= 1
-                    try:
-                        if shoot_sfx and not is_muted:
-                            shoot_sfx.play()
-                    except:
-                        pass
-                shot_locked = True
-            if not index_open and not middle_open:
-                shot_locked = False
-
-            # ---------- Update sprites ----------
-            for spr in list(all_sprites):
-                if isinstance(spr, Cannon):
-                    continue
-                spr.update()
-            cannon.update(finger_x=finger_x, key_dx=key_dx)
-
-            player_bullets.update()
-            alien_bullets.update()
-            explosions.update()
-            powerups.update()
-
-            # ---------- Collisions ----------
-            hits = pygame.sprite.groupcollide(player_bullets, aliens, True, False)
-            for pb, alist in hits.items():
-                for a in alist:
-                    a.hp -= 1
-                    if a.hp <= 0:
-                        exp = Explosion(a.rect.center)
-                        all_sprites.add(exp); explosions.add(exp)
-                        try:
-                            if explosion_sfx and not is_muted:
-                                explosion_sfx.play()
-                        except:
-                            pass
-                        if getattr(a, "strong", False):
-                            score += 50
-                            lives += 1
-                        else:
-                            score += 10 * (1 if a.typ == "small" else 2)
-                        if random.random() < 0.25:
-                            kind = random.choice(["ammo", "shield"]) if (level > 5) else "ammo"
-                            pu = PowerUp(kind, a.rect.centerx, a.rect.centery)
-                            all_sprites.add(pu); powerups.add(pu)
-                        a.kill()
-
-            hits2 = pygame.sprite.spritecollide(cannon, alien_bullets, True)
-            if hits2:
-                if not cannon.shield:
-                    lives -= 1
-                    exp = Explosion(cannon.rect.center)
-                    all_sprites.add(exp); explosions.add(exp)
-                    try:
-                        if hit_sfx and not is_muted:
-                            hit_sfx.play()
-                    except:
-                        pass
-                else:
-                    cannon.shield = False
+                    for i, (k_left, k_right, _k_fire) in enumerate(key_map):
+                        if ev.key in (k_left, k_right):
+                            key_dx[i] = 0
 
-            p_hits = pygame.sprite.spritecollide(cannon, powerups, True)
-            for pu in p_hits:
-                try:
-                    if powerup_sfx and not is_muted:
-                        powerup_sfx.play()
-                except:
-                    pass
-                if pu.kind == "ammo":
-                    ammo += 5
-                elif pu.kind == "shield":
-                    if level > 5:
-                        cannon.shield = True
-                        cannon.shield_timer = pygame.time.get_ticks()
-
-            # ---------- Level progression ----------
-            if len(aliens) == 0:
-                level += 1
-                ammo = MAX_AMMO
-                create_aliens(level)
-                for a in list(aliens):
-                    if not getattr(a, "strong", False):
-                        a.fire_enabled = (level > 5)
+        if autopilot:
+            inputs = [PlayerInput(*autopilot_controls(session, c)) for c in session.cannons]
+        else:
+            inputs = [PlayerInput(key_dx[i], fire[i], gestures[i]) for i in range(n)]
+
+        if not paused:  # freeze the game while paused
+            session.step(inputs, frame_ms)
 
         # ---------- Draw ----------
-        screen.blit(background, (0, 0))
-        for s in all_sprites:
-            screen.blit(s.image, s.rect)
-        for a in aliens:
-            a.draw_health(screen)
-        draw_hud(player_name, score, level, lives, ammo, start_time, elapsed_pause_time)
-        if cannon.shield:
-            pygame.draw.circle(screen, BLUE, cannon.rect.center, 42, 3)
+        session.draw(screen)
 
         # Draw mute/unmute icon
-        icon = mute_icon if is_muted else unmute_icon
+        icon = mute_icon if audio.muted else unmute_icon
         screen.blit(icon, (WIDTH - icon.get_width() - 12, 12))
 
+        if recorder:
+            recorder.capture(screen)
         pygame.display.flip()
 
         # ---------- End conditions ----------
-        if lives <= 0 or (ammo <= 0 and len(player_bullets) == 0):
+        timed_out = max_seconds is not None and now - start_time - elapsed_pause_time >= max_seconds
+        if session.over or timed_out:
             played_seconds = int(time.time() - start_time)
-            save_score_record(player_name, score, level, played_seconds)
-            show_game_over(player_name, score, level, played_seconds)
-            return
+            level = session.level
+            if not autopilot:
+                for c in session.cannons:
+                    save_score_record(c.name, c.score, level, played_seconds)
+                    if leaderboard:
+                        leaderboard.submit(c.name, c.score, level, played_seconds)
+                show_game_over([(c.name, c.score) for c in session.cannons], level, played_seconds)
+            return session.score, level, played_seconds
 
 # ---------- Instruction Screen ----------
 def show_instructions():
@@ -852,25 +1249,59 @@ def show_countdown():
 
 # ---------- Main ----------
 def main():
-    global player_name
-    player_name = get_player_name_screen()
+    global recorder, telemetry, leaderboard
+    parser = argparse.ArgumentParser(description="Space Invaders - Gesture + Keyboard")
+    parser.add_argument("--telemetry", metavar="FILE",
+                        help="append per-frame and per-event telemetry records to FILE (read with telemetry.py)")
+    parser.add_argument("--players", type=int, choices=(1, 2), default=1,
+                        help="2 = co-op: one hand per player (keyboard: arrows/SPACE and A/D/W)")
+    parser.add_argument("--bench-hands", type=int, metavar="FRAMES",
+                        help="compare one- and two-hand inference cost on FRAMES webcam frames and exit")
+    parser.add_argument("--bench-capture", type=int, metavar="FRAMES",
+                        help="compare the buffered capture path with flip + convert on FRAMES webcam frames and exit")
+    parser.add_argument("--record", type=float, metavar="SECONDS",
+                        help="keep the last SECONDS of gameplay in memory (about 12 MB per second, at half "
+                             "resolution); press F9 to save a clip")
+    parser.add_argument("--leaderboard", metavar="URL",
+                        help="sync scores with a global leaderboard server (queued locally while offline)")
+    args = parser.parse_args()
+    if args.leaderboard:
+        from leaderboard import LeaderboardClient
+        leaderboard = LeaderboardClient(args.leaderboard)
+    if args.record:
+        from recorder import ClipRecorder
+        recorder = ClipRecorder(screen, seconds=args.record, source_fps=FPS)
+    if args.telemetry:
+        from telemetry import TelemetryWriter
+        telemetry = TelemetryWriter(args.telemetry)
+
+    init_gesture(args.players)
+    if args.bench_hands:
+        benchmark_hands(args.bench_hands)
+        cleanup_and_quit()
+    if args.bench_capture:
+        benchmark_capture(args.bench_capture)
+        cleanup_and_quit()
+    audio.start_music(ASSETS["bg_music"])
+
+    if args.players == 1:
+        player_names = [get_player_name_screen()]
+    else:
+        player_names = [get_player_name_screen(f"Player {i + 1}, enter your name", f"Player {i + 1}")
+                        for i in range(args.players)]
     show_instructions()
     try:
         while True:
             show_countdown()
-            run_game(player_name)
+            run_game(player_names)
     finally:
-        try:
-            if hands:
-                hands.close()
-        except:
-            pass
-        try:
-            if cap and cap.isOpened():
-                cap.release()
-            cv2.destroyAllWindows()
-        except:
-            pass
+        if inference_stats["frames"]:
+            ms = inference_stats["seconds"] / inference_stats["frames"] * 1000
+            print(f"[gesture] hands.process: {ms:.2f} ms/frame over {inference_stats['frames']} frames "
+                  f"(max_num_hands={args.players})")
+        if camera:
+            print(f"[gesture] capture: {camera.stats()}")
+        shutdown()
         pygame.quit()
 
 if __name__ == "__main__":
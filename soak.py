@@ -0,0 +1,113 @@
+# soak.py
+# Long-running soak test: plays auto-piloted games back-to-back and reports memory growth per game.
+#   python soak.py --hours 8 --headless --csv soak.csv
+import argparse, fnmatch, gc, os, sys, time, tracemalloc, resource
+
+TRACKED = ("GameSession", "Alien", "StrongAlien", "PlayerBullet", "AlienBullet", "Explosion", "PowerUp", "Cannon")
+
+def rss_kb():
+    """Current resident set size in KB (falls back to peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    except Exception:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def live_counts(shoot):
+    classes = {getattr(shoot, name): name for name in TRACKED}
+    counts = dict.fromkeys(TRACKED, 0)
+    for obj in gc.get_objects():
+        name = classes.get(type(obj))
+        if name:
+            counts[name] += 1
+    return counts
+
+def take_sample(shoot):
+    gc.collect()
+    snap = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, fnmatch.__file__),
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    ))
+    traced, _peak = tracemalloc.get_traced_memory()
+    return {
+        "rss_kb": rss_kb(),
+        "traced_kb": traced // 1024,
+        "gc_objects": len(gc.get_objects()),
+        "counts": live_counts(shoot),
+        "snapshot": snap,
+    }
+
+def main():
+    ap = argparse.ArgumentParser(description="Space Invaders soak test")
+    ap.add_argument("--hours", type=float, default=1.0, help="total run time (default 1h)")
+    ap.add_argument("--games", type=int, default=0, help="stop after N games (0 = no limit)")
+    ap.add_argument("--max-game-seconds", type=float, default=120, help="cut each game off after this long")
+    ap.add_argument("--headless", action="store_true", help="no window and no audio device")
+    ap.add_argument("--fast", action="store_true", help="run frames uncapped instead of at FPS")
+    ap.add_argument("--top", type=int, default=5, help="allocation sites to print per game")
+    ap.add_argument("--csv", help="append one row per game to this file")
+    args = ap.parse_args()
+
+    if args.headless:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    import shoot
+    # Start tracing after the (heavy) imports so snapshots only cover gameplay
+    tracemalloc.start(10)
+
+    csv_file = None
+    if args.csv:
+        new = not os.path.exists(args.csv)
+        csv_file = open(args.csv, "a", encoding="utf-8")
+        if new:
+            csv_file.write("game,score,level,played,rss_kb,traced_kb,gc_objects," + ",".join(TRACKED) + "\n")
+
+    baseline = take_sample(shoot)
+    prev = baseline
+    deadline = time.time() + args.hours * 3600
+    game = 0
+    print(f"[soak] baseline rss={baseline['rss_kb']}KB traced={baseline['traced_kb']}KB gc_objects={baseline['gc_objects']}")
+    try:
+        while time.time() < deadline and (args.games == 0 or game < args.games):
+            game += 1
+            score, level, played = shoot.run_game(["SOAK"], autopilot=True, max_seconds=args.max_game_seconds,
+                                                  fps=0 if args.fast else shoot.FPS)
+            # The finished session is unreferenced now, so anything still alive is a leak
+            cur = take_sample(shoot)
+
+            leaked = {k: v for k, v in cur["counts"].items() if v}
+            print(f"[soak] game {game}: score={score} level={level} played={played}s | "
+                  f"rss={cur['rss_kb']}KB ({cur['rss_kb'] - prev['rss_kb']:+d}) "
+                  f"traced={cur['traced_kb']}KB ({cur['traced_kb'] - prev['traced_kb']:+d}) "
+                  f"gc_objects={cur['gc_objects']} ({cur['gc_objects'] - prev['gc_objects']:+d})")
+            if leaked:
+                print(f"[soak]   still alive after the game: {leaked}")
+            for stat in cur["snapshot"].compare_to(prev["snapshot"], "lineno")[:args.top]:
+                if stat.size_diff:
+                    print(f"[soak]   {stat}")
+
+            if csv_file:
+                csv_file.write(f"{game},{score},{level},{played},{cur['rss_kb']},{cur['traced_kb']},{cur['gc_objects']},"
+                               + ",".join(str(cur["counts"][k]) for k in TRACKED) + "\n")
+                csv_file.flush()
+            prev = cur
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if csv_file:
+            csv_file.close()
+
+    if game:
+        print(f"[soak] {game} games: rss {baseline['rss_kb']}KB -> {prev['rss_kb']}KB "
+              f"({(prev['rss_kb'] - baseline['rss_kb']) / game:+.1f}KB/game), "
+              f"traced {baseline['traced_kb']}KB -> {prev['traced_kb']}KB "
+              f"({(prev['traced_kb'] - baseline['traced_kb']) / game:+.1f}KB/game)")
+    print(f"[soak] audio: {shoot.audio.stats()}")
+    shoot.cleanup_and_quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# stress.py
+# Endless stress run: formation waves that grow every level, with per-level frame-time and entity counts.
+#   python stress.py --headless --csv stress.csv        run until 3 levels in a row miss the 60 FPS budget
+#   python stress.py --levels 40 --frames 300           fixed number of levels, shorter ones
+import argparse, os, time
+
+def percentile(sorted_vals, p):
+    if not sorted_vals:
+        return 0.0
+    return sorted_vals[min(len(sorted_vals) - 1, int(len(sorted_vals) * p / 100))]
+
+def run_level(shoot, session, frames, draw):
+    """Play up to `frames` autopilot ticks of the current level; returns frame times and entity counts.
+    Stops early if the autopilot clears the wave, so a row never mixes two levels."""
+    dt = 1000 / shoot.FPS
+    level = session.level
+    frame_ms, step_ms = [], []
+    aliens = alien_bullets = sprites = 0
+    peak_sprites = peak_bullets = 0
+    for _ in range(frames):
+        t0 = time.perf_counter()
+        inputs = [shoot.PlayerInput(*shoot.autopilot_controls(session, c)) for c in session.cannons]
+        session.step(inputs, dt)
+        t1 = time.perf_counter()
+        if draw:
+            session.draw(shoot.screen)
+            shoot.pygame.display.flip()
+            shoot.pygame.event.pump()
+        t2 = time.perf_counter()
+        step_ms.append((t1 - t0) * 1000)
+        frame_ms.append((t2 - t0) * 1000)
+        aliens += len(session.aliens)
+        alien_bullets += len(session.alien_bullets)
+        sprites += len(session.all_sprites)
+        peak_sprites = max(peak_sprites, len(session.all_sprites))
+        peak_bullets = max(peak_bullets, len(session.alien_bullets))
+        if session.level != level:
+            break
+    frames = len(frame_ms)
+    frame_ms.sort()
+    return {
+        "mean_ms": sum(frame_ms) / frames,
+        "step_ms": sum(step_ms) / frames,
+        "p95_ms": percentile(frame_ms, 95),
+        "p99_ms": percentile(frame_ms, 99),
+        "max_ms": frame_ms[-1],
+        "aliens": aliens / frames,
+        "alien_bullets": alien_bullets / frames,
+        "sprites": sprites / frames,
+        "peak_bullets": peak_bullets,
+        "peak_sprites": peak_sprites,
+        "frames": frames,
+    }
+
+def main():
+    ap = argparse.ArgumentParser(description="Space Invaders endless stress test")
+    ap.add_argument("--levels", type=int, default=0, help="stop after N levels (0 = until the budget breaks)")
+    ap.add_argument("--frames", type=int, default=600, help="frames measured per level (default 600 = 10s of play)")
+    ap.add_argument("--stop-after", type=int, default=3,
+                    help="endless mode: stop after this many consecutive levels over budget")
+    ap.add_argument("--no-draw", action="store_true", help="measure game logic only (skip drawing)")
+    ap.add_argument("--headless", action="store_true", help="no window and no audio device")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--csv", help="write one row per level to this file")
+    args = ap.parse_args()
+    if args.frames < 1:
+        ap.error("--frames must be at least 1")
+
+    if args.headless:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    import shoot
+    budget_ms = 1000 / shoot.FPS
+
+    cols = ("level", "formation", "spawned", "frames", "aliens", "alien_bullets", "sprites", "peak_bullets", "peak_sprites",
+            "step_ms", "mean_ms", "p95_ms", "p99_ms", "max_ms")
+    csv_file = None
+    if args.csv:
+        csv_file = open(args.csv, "w", encoding="utf-8")
+        csv_file.write(",".join(cols) + "\n")
+
+    session = shoot.GameSession(["STRESS"], seed=args.seed, stress=True)
+    print(f"[stress] {args.frames} frames per level, budget {budget_ms:.2f} ms/frame (p95)"
+          f"{', logic only' if args.no_draw else ''}")
+    print(f"[stress] {'lvl':>4} {'wave':>8} {'spawn':>6} {'frames':>6} {'aliens':>7} {'abul':>6} {'sprites':>8} "
+          f"{'step':>6} {'mean':>6} {'p95':>6} {'p99':>6} {'max':>6}")
+    last_ok = None
+    first_over = None
+    over_streak = 0
+    try:
+        while not args.levels or session.level <= args.levels:
+            level = session.level
+            formation, slots = shoot.formation_layout(level)
+            row = run_level(shoot, session, args.frames, draw=not args.no_draw)
+            row.update(level=level, formation=formation, spawned=len(slots))
+            over = row["p95_ms"] > budget_ms
+            print(f"[stress] {level:>4} {formation:>8} {len(slots):>6} {row['frames']:>6} {row['aliens']:>7.0f} {row['alien_bullets']:>6.0f} "
+                  f"{row['sprites']:>8.0f} {row['step_ms']:>6.2f} {row['mean_ms']:>6.2f} {row['p95_ms']:>6.2f} "
+                  f"{row['p99_ms']:>6.2f} {row['max_ms']:>6.2f}{'  OVER' if over else ''}")
+            if csv_file:
+                csv_file.write(",".join(f"{row[k]:.3f}" if isinstance(row[k], float) else str(row[k]) for k in cols) + "\n")
+                csv_file.flush()
+            if over:
+                over_streak += 1
+                if first_over is None:
+                    first_over = row
+            else:
+                over_streak = 0
+                last_ok = row
+            if not args.levels and over_streak >= args.stop_after:
+                break
+            # Start the next wave on schedule unless the autopilot already cleared this one.
+            # Its layout is built here, outside the timed frames; the cache keeps only this level and the next.
+            shoot.formation_layout(level + 1)
+            if session.level == level:
+                for spr in list(session.aliens) + list(session.alien_bullets):
+                    spr.kill()
+                session.next_level()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if csv_file:
+            csv_file.close()
+
+    if last_ok:
+        print(f"[stress] last level within budget: {last_ok['level']} ({last_ok['spawned']} spawned, "
+              f"~{last_ok['sprites']:.0f} sprites, p95 {last_ok['p95_ms']:.2f} ms)")
+    if first_over:
+        print(f"[stress] first level over budget: {first_over['level']} ({first_over['spawned']} spawned, "
+              f"~{first_over['sprites']:.0f} sprites, p95 {first_over['p95_ms']:.2f} ms)")
+    else:
+        print(f"[stress] every level held {shoot.FPS} FPS")
+    shoot.cleanup_and_quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+# telemetry.py
+# Fixed-size binary per-frame/per-event telemetry, plus a memory-mapped reader.
+#   python shoot.py --telemetry session.tlm
+#   python telemetry.py session.tlm
+import os, sys, struct, time
+import numpy as np
+
+MAGIC = b"SITLM"
+VERSION = 2                          # 2: t_ms widened to u8
+HEADER = struct.Struct("<5sBHQ")     # magic, version, record size, start time (unix ms)
+
+# Record kinds. Meaning of the generic x/y/a/b/v fields per kind:
+GAME = 0         # a = players
+FRAME = 1        # v = frame time (ms), a = aliens, b = alien bullets, x = player bullets, y = sprites
+SHOT = 2         # x, y = muzzle position
+HIT = 3          # x, y = alien position, a = hp left
+KILL = 4         # x, y = alien position, a = points
+POWERUP = 5      # x, y = pickup position, a = 0 ammo / 1 shield
+PLAYER_HIT = 6   # x, y = cannon position, a = 1 if the shield absorbed it
+LIVES = 7        # a = new lives
+AMMO = 8         # a = new ammo
+LEVEL = 9        # a = new level
+GESTURE = 10     # v = finger_x (0..1), a = 1 index open | 2 middle open
+
+KIND_NAMES = {GAME: "game", FRAME: "frame", SHOT: "shot", HIT: "hit", KILL: "kill", POWERUP: "powerup",
+              PLAYER_HIT: "player_hit", LIVES: "lives", AMMO: "ammo", LEVEL: "level", GESTURE: "gesture"}
+POWERUP_CODES = {"ammo": 0, "shield": 1}
+
+RECORD = np.dtype([
+    ("kind", "u1"),
+    ("player", "u1"),
+    ("x", "<i2"),
+    ("frame", "<u4"),
+    ("t_ms", "<u8"),      # ms since the start time in the file header (appended files outlive u4's 49 days)
+    ("y", "<i4"),         # wide enough for entity counts in FRAME records
+    ("b", "<i4"),
+    ("a", "<i4"),
+    ("v", "<f4"),
+])                        # 32 bytes, packed
+
+class TelemetryWriter:
+    """Appends records to a preallocated buffer and writes it out in large blocks.
+
+    Recording an event is one structured-array row assignment. The file is written only
+    when the buffer fills (every `capacity` records) or on flush()/close().
+    """
+
+    def __init__(self, path, capacity=8192):
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        if new:
+            self.start = time.time()
+        else:
+            # appending: keep t_ms relative to the start time in the existing header
+            self.start = read_header(path) / 1000
+        self.f = open(path, "ab" if new else "r+b")
+        if new:
+            self.f.write(HEADER.pack(MAGIC, VERSION, RECORD.itemsize, int(self.start * 1000)))
+        else:
+            # drop a partial record left by a crash, or every record after it would be misaligned
+            count = (os.path.getsize(path) - HEADER.size) // RECORD.itemsize
+            self.f.truncate(HEADER.size + count * RECORD.itemsize)
+            self.f.seek(0, os.SEEK_END)
+        self.buf = np.zeros(capacity, RECORD)
+        self.n = 0
+        self.frame_no = 0
+        self.last = {}        # (kind, player) -> last value written for state records
+        self.records = 0
+
+    def emit(self, kind, player=0, x=0, y=0, a=0, b=0, v=0.0):
+        if self.n == len(self.buf):
+            self.flush()
+        self.buf[self.n] = (kind, player, x, self.frame_no, int((time.time() - self.start) * 1000), y, b, a, v)
+        self.n += 1
+        self.records += 1
+
+    # ---------- Events ----------
+    def game(self, players):
+        self.last.clear()
+        self.emit(GAME, a=players)
+
+    def shot(self, player, x, y):
+        self.emit(SHOT, player, x, y)
+
+    def hit(self, player, x, y, hp_left):
+        self.emit(HIT, player, x, y, a=hp_left)
+
+    def kill(self, player, x, y, points):
+        self.emit(KILL, player, x, y, a=points)
+
+    def powerup(self, player, x, y, kind):
+        self.emit(POWERUP, player, x, y, a=POWERUP_CODES.get(kind, 0))
+
+    def player_hit(self, player, x, y, shielded):
+        self.emit(PLAYER_HIT, player, x, y, a=int(shielded))
+
+    def gesture(self, player, finger_x, index_open, middle_open):
+        self.emit(GESTURE, player, a=int(index_open) | (int(middle_open) << 1), v=finger_x)
+
+    def _changed(self, kind, value, player=0):
+        key = (kind, player)
+        if self.last.get(key) != value:
+            self.last[key] = value
+            self.emit(kind, player, a=value)
+
+    def state(self, lives, level, ammo):
+        """Record lives, level and each player's ammo, but only the values that changed."""
+        self._changed(LIVES, lives)
+        self._changed(LEVEL, level)
+        for player, value in enumerate(ammo):
+            self._changed(AMMO, value, player)
+
+    def frame(self, frame_ms, aliens, alien_bullets, player_bullets, sprites):
+        self.emit(FRAME, x=player_bullets, y=sprites, a=aliens, b=alien_bullets, v=frame_ms)
+        self.frame_no += 1
+
+    # ---------- Output ----------
+    def flush(self):
+        if self.n:
+            self.f.write(self.buf[:self.n].data)
+            self.n = 0
+        self.f.flush()
+
+    def close(self):
+        self.flush()
+        self.f.close()
+
+# ---------- Reader ----------
+def read_header(path):
+    """Validate the file header and return the start time (unix ms)."""
+    with open(path, "rb") as f:
+        raw = f.read(HEADER.size)
+    if len(raw) < HEADER.size:
+        raise ValueError(f"{path}: not a telemetry file")
+    magic, version, size, start_ms = HEADER.unpack(raw)
+    if magic != MAGIC or version != VERSION or size != RECORD.itemsize:
+        raise ValueError(f"{path}: not a version {VERSION} telemetry file")
+    return start_ms
+
+def open_telemetry(path):
+    """Memory-map a telemetry file. Returns (start_unix_ms, structured array of records).
+    A partially written last record (e.g. after a crash) is ignored."""
+    start_ms = read_header(path)
+    count = (os.path.getsize(path) - HEADER.size) // RECORD.itemsize
+    if count == 0:
+        return start_ms, np.zeros(0, RECORD)
+    return start_ms, np.memmap(path, dtype=RECORD, mode="r", offset=HEADER.size, shape=(count,))
+
+def select(records, kind):
+    return records[records["kind"] == kind]
+
+def summarize(records):
+    kinds = np.bincount(records["kind"], minlength=len(KIND_NAMES))
+    frames = select(records, FRAME)
+    out = {"records": len(records), "games": int(kinds[GAME]),
+           "counts": {KIND_NAMES[k]: int(c) for k, c in enumerate(kinds) if c and k in KIND_NAMES}}
+    if len(frames):
+        ft = frames["v"]
+        out["frame_ms"] = {"mean": round(float(ft.mean()), 2), "p99": round(float(np.percentile(ft, 99)), 2),
+                           "max": round(float(ft.max()), 2)}
+        out["max_aliens"] = int(frames["a"].max())
+        out["max_sprites"] = int(frames["y"].max())
+    if kinds[SHOT]:
+        out["accuracy"] = round(float(kinds[HIT] / kinds[SHOT]), 3)
+    return out
+
+def main():
+    if len(sys.argv) < 2:
+        print("usage: python telemetry.py FILE.tlm")
+        sys.exit(1)
+    for path in sys.argv[1:]:
+        _start, recs = open_telemetry(path)
+        print(path, summarize(recs))
+
+if __name__ == "__main__":
+    main()